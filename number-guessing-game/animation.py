@@ -0,0 +1,124 @@
+import math
+import time
+
+# 🎞️ Frame-driven animation scheduler
+#
+# Everything that changes over time in the window (color fades, confetti,
+# the running timer) is a job registered under a key:
+#
+#   animator.tween("feedback-color", 0.15, lambda t: ...)   # t goes 0 -> 1
+#   animator.every("timer", 0.1, refresh)                     # until cancelled
+#
+# One root.after() callback per frame runs the jobs that are due. Starting a
+# job under a key that is already running replaces it, so a new guess takes
+# over the fade of the previous one instead of both fighting over the color.
+# Tweens are driven by elapsed time, not by frame count: a late or skipped
+# frame makes them jump ahead, never run longer. At most `max_jobs` jobs run
+# per frame; the ones left over run first in the next frame. While only
+# periodic jobs are left, frames are only scheduled when one is due, and with
+# nothing to animate no frame is scheduled at all.
+
+FRAME_MS = 16
+MAX_JOBS = 8
+
+
+class _Job:
+    __slots__ = ('step', 'start', 'duration', 'interval', 'next_run', 'last_frame')
+
+    def __init__(self, step, start, duration=None, interval=None):
+        self.step = step
+        self.start = start
+        self.duration = duration
+        self.interval = interval
+        self.next_run = start
+        self.last_frame = -1
+
+
+class Animator:
+    def __init__(self, root, frame_ms=FRAME_MS, max_jobs=MAX_JOBS, clock=time.monotonic):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.max_jobs = max_jobs
+        self.clock = clock
+        self.frames = 0
+        self._jobs = {}
+        self._frame_id = None
+        self._frame_at = None
+
+    # 🎬 Jobs
+    def tween(self, key, duration, step):
+        # step(t) is called once per frame with t rising from 0 to 1 over
+        # `duration` seconds, and always ends with step(1).
+        self._start(key, _Job(step, self.clock(), duration=max(duration, 1e-9)))
+
+    def every(self, key, interval, step):
+        # step() runs about every `interval` seconds until cancel(key).
+        self._start(key, _Job(step, self.clock(), interval=interval))
+
+    def cancel(self, key):
+        self._jobs.pop(key, None)
+        if not self._jobs and self._frame_id is not None:
+            self.root.after_cancel(self._frame_id)
+            self._frame_id = None
+
+    def running(self, key):
+        return key in self._jobs
+
+    def _start(self, key, job):
+        # Replaces whatever ran under `key`, without waiting for its end.
+        self._jobs[key] = job
+        self._schedule(job.start)
+
+    def _schedule(self, when):
+        # Makes sure a frame runs at `when` (or one frame from now, if later).
+        when = max(when, self.clock() + self.frame_ms / 1000)
+        if self._frame_id is not None:
+            if self._frame_at <= when:
+                return
+            self.root.after_cancel(self._frame_id)
+        self._frame_at = when
+        # Rounded up: a frame that runs before `when` finds nothing due.
+        self._frame_id = self.root.after(max(math.ceil((when - self.clock()) * 1000), 1), self._frame)
+
+    # 🖼️ Frames
+    def _frame(self):
+        self._frame_id = None
+        self.frames += 1
+        now = self.clock()
+        # Jobs skipped last frame first, then in the order they started.
+        due = sorted((job.last_frame, n, key, job) for n, (key, job) in enumerate(self._jobs.items())
+                     if job.next_run <= now)
+        for _, _, key, job in due[:self.max_jobs]:
+            if self._jobs.get(key) is not job:
+                continue  # cancelled or replaced by an earlier job this frame
+            job.last_frame = self.frames
+            if job.interval is not None:
+                # On the job's own beat, so late frames do not add up; one
+                # that fell a whole interval behind starts over from now.
+                job.next_run += job.interval
+                if job.next_run <= now:
+                    job.next_run = now + job.interval
+                job.step()
+            else:
+                t = min((now - job.start) / job.duration, 1.0)
+                if t >= 1.0:
+                    del self._jobs[key]
+                job.step(t)
+        if self._jobs:
+            self._schedule(min(job.next_run for job in self._jobs.values()))
+
+
+# 🎨 Colors
+def hex_to_rgb(h):
+    return tuple(int(h[i:i+2], 16) for i in (1, 3, 5))
+
+
+def rgb_to_hex(r, g, b):
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def blend(start, end, t):
+    # The color `t` of the way from `start` to `end` (both "#rrggbb").
+    a = hex_to_rgb(start)
+    b = hex_to_rgb(end)
+    return rgb_to_hex(*(int(x + (y - x) * t) for x, y in zip(a, b)))
@@ -0,0 +1,107 @@
+import random
+import time
+
+# 🎯 Headless game engine
+#
+# GameSession holds one game: the secret number, the attempts so far and the
+# range that is still possible. It knows nothing about Tkinter, so the same
+# rules drive the window in guessing_game.py, scripts and simulations:
+#
+#   session = GameSession()
+#   session.guess(50)        -> LOW, HIGH, CLOSE_LOW, CLOSE_HIGH or CORRECT
+#
+# A guess outside the range still possible is OUT_OF_RANGE and is not
+# counted; every other guess is, and narrows the range to the side of the
+# secret it revealed. A wrong guess within CLOSE_DISTANCE of the secret is
+# "very close". Guesses after the game is won are OVER.
+#
+# The clock only matters for the time shown to the player and the best
+# score; simulations can pass their own (or a constant) clock and rng.
+
+LOWEST = 1
+HIGHEST = 100
+CLOSE_DISTANCE = 5
+
+# Outcomes of GameSession.guess()
+LOW = 'low'
+HIGH = 'high'
+CLOSE_LOW = 'close_low'
+CLOSE_HIGH = 'close_high'
+CORRECT = 'correct'
+OUT_OF_RANGE = 'out_of_range'
+OVER = 'over'
+
+
+class GameSession:
+    __slots__ = ('lowest', 'highest', 'rng', 'clock', 'secret', 'low', 'high', 'guesses',
+                 'active', 'started', 'finished')
+
+    def __init__(self, lowest=LOWEST, highest=HIGHEST, rng=None, clock=time.monotonic, secret=None):
+        self.lowest = lowest
+        self.highest = highest
+        self.rng = rng or random
+        self.clock = clock
+        self.reset(secret)
+
+    def reset(self, secret=None):
+        self.secret = self.rng.randint(self.lowest, self.highest) if secret is None else secret
+        # The range still possible, narrowed by each wrong guess.
+        self.low = self.lowest
+        self.high = self.highest
+        self.guesses = []
+        self.active = True
+        self.started = None
+        self.finished = None
+
+    @property
+    def attempts(self):
+        return len(self.guesses)
+
+    def elapsed(self):
+        # Seconds since the first counted guess, up to the winning one.
+        if self.started is None:
+            return 0.0
+        return (self.finished if self.finished is not None else self.clock()) - self.started
+
+    def guess(self, number):
+        if not self.active:
+            return OVER
+        if number < self.low or number > self.high:
+            return OUT_OF_RANGE
+        if not self.guesses:
+            self.started = self.clock()
+        self.guesses.append(number)
+        secret = self.secret
+        if number == secret:
+            self.finished = self.clock()
+            self.active = False
+            return CORRECT
+        if number < secret:
+            self.low = number + 1
+            return CLOSE_LOW if secret - number <= CLOSE_DISTANCE else LOW
+        self.high = number - 1
+        return CLOSE_HIGH if number - secret <= CLOSE_DISTANCE else HIGH
+
+
+class BestScore:
+    # Fewest attempts wins; equal attempts are decided by time.
+    def __init__(self):
+        self.attempts = None
+        self.seconds = None
+
+    def record(self, attempts, seconds):
+        # True if this result is the new best.
+        if self.attempts is None or attempts < self.attempts \
+                or (attempts == self.attempts and seconds < self.seconds):
+            self.attempts = attempts
+            self.seconds = seconds
+            return True
+        return False
+
+
+def play(session, choose):
+    # Plays a whole game with `choose(low, high)` picking each guess from the
+    # range still possible; returns the number of attempts it took.
+    while session.guess(choose(session.low, session.high)) != CORRECT:
+        pass
+    return session.attempts
@@ -1,7 +1,18 @@
 import tkinter as tk
-import random
 import sys
-import time
+from collections import deque
+import getpass
+import argparse
+
+from game_engine import GameSession, BestScore, LOW, HIGH, CLOSE_LOW, CLOSE_HIGH, CORRECT, OUT_OF_RANGE
+from animation import Animator, blend
+from leaderboard import Leaderboard, DB_FILE
+
+# The window is a thin view: every rule lives in GameSession (game_engine.py),
+# and GameView only turns its outcomes into text, colors and sounds. Fades,
+# confetti and the running timer all go through one Animator (animation.py).
+# Finished games are saved to the leaderboard (leaderboard.py) in the
+# background, and the best score shown is the player's best ever.
 
 # --- Dark Theme Colors ---
 BG_COLOR = "#23272f"
@@ -17,6 +28,12 @@ FEEDBACK_COLORS = {
     "error": "#bd93f9"
 }
 
+# --- Animation timing (seconds) ---
+FADE_SECONDS = 0.15
+CONFETTI_SECONDS = 0.72
+CONFETTI_COUNT = 10
+TIMER_INTERVAL = 0.1
+
 # --- Sound Effects ---
 def beep_correct():
     if sys.platform == "win32":
@@ -32,269 +49,341 @@ def beep_wrong():
     else:
         print('\a', end='')
 
-# --- Game State ---
-secret_number = random.randint(1, 100)
-guess_count = 0
-game_active = True
-guesses = []
-min_range = 1
-max_range = 100
-start_time = None
-timer_id = None
-best_score = None
-best_time = None
+# --- Hint text and color per outcome ---
+HINTS = {
+    LOW: ("Too low! Try again. 😅", "low"),
+    HIGH: ("Too high! Try again. 🤔", "high"),
+    CLOSE_LOW: ("Too low! But you're very close! 🔥", "close"),
+    CLOSE_HIGH: ("Too high! But you're very close! 🔥", "close"),
+}
 
-# --- Main Window ---
-root = tk.Tk()
-root.title("Number Guessing Game")
-root.geometry("440x500")
-root.configure(bg=BG_COLOR)
-
-# --- UI Elements ---
-title = tk.Label(
-    root,
-    text="Guess a number between 1 and 100",
-    font=("Arial", 14, "bold"),
-    bg=BG_COLOR,
-    fg=FG_COLOR
-)
-title.pack(pady=10)
-
-entry = tk.Entry(
-    root,
-    font=("Arial", 12),
-    bg=ENTRY_BG,
-    fg=FG_COLOR,
-    insertbackground=FG_COLOR,
-    highlightbackground=BTN_BG,
-    highlightcolor=BTN_BG,
-    justify="center"
-)
-entry.pack()
-
-feedback = tk.Label(
-    root,
-    text="",
-    font=("Arial", 12, "bold"),
-    bg=BG_COLOR,
-    fg=FG_COLOR
-)
-feedback.pack(pady=10)
-
-counter_label = tk.Label(
-    root,
-    text="Attempts: 0",
-    font=("Arial", 11),
-    bg=BG_COLOR,
-    fg="#8be9fd"
-)
-counter_label.pack(pady=2)
-
-range_hint = tk.Label(
-    root,
-    text="Range: 1 - 100",
-    font=("Arial", 11),
-    bg=BG_COLOR,
-    fg="#bd93f9"
-)
-range_hint.pack(pady=2)
-
-timer_label = tk.Label(
-    root,
-    text="Time: 0.0s",
-    font=("Arial", 11),
-    bg=BG_COLOR,
-    fg="#f1fa8c"
-)
-timer_label.pack(pady=2)
-
-highscore_label = tk.Label(
-    root,
-    text="Best: -- attempts, -- s",
-    font=("Arial", 11),
-    bg=BG_COLOR,
-    fg="#50fa7b"
-)
-highscore_label.pack(pady=2)
-
-history_label = tk.Label(
-    root,
-    text="Previous guesses: ",
-    font=("Arial", 11),
-    bg=BG_COLOR,
-    fg="#8be9fd",
-    justify="left",
-    anchor="w"
-)
-history_label.pack(fill="x", padx=20, pady=5)
-
-# --- Animated feedback transition ---
-def animate_feedback(target_color):
-    current = feedback.cget("fg")
-    if current == target_color:
-        return
-    steps = 10
-    def hex_to_rgb(h): return tuple(int(h[i:i+2], 16) for i in (1, 3, 5))
-    def rgb_to_hex(r, g, b): return f"#{r:02x}{g:02x}{b:02x}"
-    start = hex_to_rgb(current)
-    end = hex_to_rgb(target_color)
-    for i in range(1, steps+1):
-        r = int(start[0] + (end[0] - start[0]) * i / steps)
-        g = int(start[1] + (end[1] - start[1]) * i / steps)
-        b = int(start[2] + (end[2] - start[2]) * i / steps)
-        color = rgb_to_hex(r, g, b)
-        root.after(i*15, lambda c=color: feedback.config(fg=c))
-
-# --- Timer ---
-def update_timer():
-    global timer_id
-    if not game_active or start_time is None:
-        return
-    elapsed = time.time() - start_time
-    timer_label.config(text=f"Time: {elapsed:.1f}s")
-    timer_id = root.after(100, update_timer)
-
-def start_timer():
-    global start_time, timer_id
-    start_time = time.time()
-    timer_label.config(text="Time: 0.0s")
-    if timer_id:
-        root.after_cancel(timer_id)
-    update_timer()
-
-def stop_timer():
-    global timer_id
-    if timer_id:
-        root.after_cancel(timer_id)
-        timer_id = None
-
-# --- Game Logic ---
-def check_guess(event=None):
-    global guess_count, game_active, min_range, max_range, best_score, best_time
-    if not game_active:
-        return
-    try:
-        guess = int(entry.get())
-        if guess < min_range or guess > max_range:
-            feedback.config(text=f"Enter a number between {min_range} and {max_range}.")
-            animate_feedback(FEEDBACK_COLORS["error"])
+
+# --- Guess history ---
+HISTORY_CAP = 200
+HISTORY_MARKS = {LOW: "↑", HIGH: "↓", CLOSE_LOW: "↑", CLOSE_HIGH: "↓", CORRECT: "✓"}
+HISTORY_COLORS = {LOW: "low", HIGH: "high", CLOSE_LOW: "close", CLOSE_HIGH: "close", CORRECT: "correct"}
+
+
+class GuessHistory:
+    # Scrollable list of the guesses, appended one at a time. Only the last
+    # `cap` guesses are kept in the widget; older ones are dropped from the
+    # front and summed up in the line above it, so each guess costs the
+    # same however long the game runs.
+    def __init__(self, parent, cap=HISTORY_CAP):
+        self.cap = cap
+        self._shown = deque()  # (guess, characters) per guess in the widget
+        self.frame = tk.Frame(parent, bg=BG_COLOR)
+        self.summary = tk.Label(
+            self.frame,
+            text="Previous guesses: ",
+            font=("Arial", 11),
+            bg=BG_COLOR,
+            fg="#8be9fd",
+            justify="left",
+            anchor="w"
+        )
+        self.summary.pack(fill="x")
+        self.text = tk.Text(
+            self.frame,
+            height=3,
+            wrap="word",
+            font=("Arial", 11),
+            bg=ENTRY_BG,
+            fg=FG_COLOR,
+            relief=tk.FLAT,
+            state="disabled"
+        )
+        scrollbar = tk.Scrollbar(self.frame, command=self.text.yview)
+        self.text.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        for name, color in FEEDBACK_COLORS.items():
+            self.text.tag_configure(name, foreground=color)
+        self.clear()
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def clear(self):
+        self._shown.clear()
+        self.dropped = 0
+        self.dropped_low = None
+        self.dropped_high = None
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.config(state="disabled")
+        self.summary.config(text="Previous guesses: ")
+
+    def add(self, guess, outcome):
+        entry = f"{guess}{HISTORY_MARKS[outcome]}  "
+        self.text.config(state="normal")
+        if len(self._shown) == self.cap:
+            self._drop()
+        self.text.insert(tk.END, entry, HISTORY_COLORS[outcome])
+        self.text.config(state="disabled")
+        self.text.see(tk.END)
+        self._shown.append((guess, len(entry)))
+
+    def _drop(self):
+        guess, length = self._shown.popleft()
+        self.text.delete("1.0", f"1.0+{length}c")
+        self.dropped += 1
+        self.dropped_low = guess if self.dropped_low is None else min(self.dropped_low, guess)
+        self.dropped_high = guess if self.dropped_high is None else max(self.dropped_high, guess)
+        self.summary.config(text=f"Previous guesses: {self.dropped} earlier between "
+                                 f"{self.dropped_low} and {self.dropped_high}, then:")
+
+
+class GameView:
+    def __init__(self, root, session=None, leaderboard=None, player=None):
+        self.root = root
+        self.session = session or GameSession()
+        self.best = BestScore()
+        self.animator = Animator(root)
+        self.leaderboard = leaderboard
+        self.player = player
+        self._build()
+        if leaderboard is not None:
+            stats = leaderboard.player(player, self.session.lowest, self.session.highest)
+            if stats is not None:
+                self.best.record(stats['best_attempts'], stats['best_seconds'])
+                self.show_best()
+
+    def show_best(self):
+        self.highscore_label.config(text=f"Best: {self.best.attempts} attempts, {self.best.seconds:.1f} s")
+
+    # --- UI Elements ---
+    def _build(self):
+        root = self.root
+        session = self.session
+        self.title = tk.Label(
+            root,
+            text=f"Guess a number between {session.lowest} and {session.highest}",
+            font=("Arial", 14, "bold"),
+            bg=BG_COLOR,
+            fg=FG_COLOR
+        )
+        self.title.pack(pady=10)
+
+        self.entry = tk.Entry(
+            root,
+            font=("Arial", 12),
+            bg=ENTRY_BG,
+            fg=FG_COLOR,
+            insertbackground=FG_COLOR,
+            highlightbackground=BTN_BG,
+            highlightcolor=BTN_BG,
+            justify="center"
+        )
+        self.entry.pack()
+
+        self.feedback = tk.Label(
+            root,
+            text="",
+            font=("Arial", 12, "bold"),
+            bg=BG_COLOR,
+            fg=FG_COLOR
+        )
+        self.feedback.pack(pady=10)
+
+        self.counter_label = tk.Label(
+            root,
+            text="Attempts: 0",
+            font=("Arial", 11),
+            bg=BG_COLOR,
+            fg="#8be9fd"
+        )
+        self.counter_label.pack(pady=2)
+
+        self.range_hint = tk.Label(
+            root,
+            text=f"Range: {session.low} - {session.high}",
+            font=("Arial", 11),
+            bg=BG_COLOR,
+            fg="#bd93f9"
+        )
+        self.range_hint.pack(pady=2)
+
+        self.timer_label = tk.Label(
+            root,
+            text="Time: 0.0s",
+            font=("Arial", 11),
+            bg=BG_COLOR,
+            fg="#f1fa8c"
+        )
+        self.timer_label.pack(pady=2)
+
+        self.highscore_label = tk.Label(
+            root,
+            text="Best: -- attempts, -- s",
+            font=("Arial", 11),
+            bg=BG_COLOR,
+            fg="#50fa7b"
+        )
+        self.highscore_label.pack(pady=2)
+
+        self.history = GuessHistory(root)
+        self.history.pack(fill="x", padx=20, pady=5)
+
+        # --- Buttons ---
+        button_frame = tk.Frame(root, bg=BG_COLOR)
+        button_frame.pack(pady=10)
+
+        self.check_button = tk.Button(
+            button_frame,
+            text="Check",
+            command=self.check_guess,
+            font=("Arial", 12, "bold"),
+            bg=BTN_BG,
+            fg=BTN_FG,
+            activebackground=BTN_FG,
+            activeforeground=BTN_BG,
+            relief=tk.RAISED,
+            bd=2,
+            width=10
+        )
+        self.check_button.grid(row=0, column=0, padx=5)
+
+        self.reset_button = tk.Button(
+            button_frame,
+            text="Reset",
+            command=self.reset_game,
+            font=("Arial", 12, "bold"),
+            bg="#6272a4",
+            fg=BTN_FG,
+            activebackground=BTN_FG,
+            activeforeground="#6272a4",
+            relief=tk.RAISED,
+            bd=2,
+            width=10
+        )
+        self.reset_button.grid(row=0, column=1, padx=5)
+
+        # --- Bindings ---
+        self.entry.bind("<Return>", self.check_guess)
+
+        # --- Focus entry on start ---
+        self.entry.focus_set()
+
+    # --- Animated feedback transition ---
+    def animate_feedback(self, target_color):
+        # Fades from whatever color is showing, even halfway through the
+        # previous fade, which this one replaces.
+        current = self.feedback.cget("fg")
+        if current == target_color:
+            self.animator.cancel("feedback-color")
+            return
+        self.animator.tween("feedback-color", FADE_SECONDS,
+                            lambda t: self.feedback.config(fg=blend(current, target_color, t)))
+
+    def confetti(self):
+        text = self.feedback.cget("text")
+        shown = [0]
+        def step(t):
+            count = 1 + int(t * (CONFETTI_COUNT - 1))
+            if count != shown[0]:
+                shown[0] = count
+                self.feedback.config(text=text + " 🎊" * count)
+        self.animator.tween("confetti", CONFETTI_SECONDS, step)
+
+    # --- Timer ---
+    def update_timer(self):
+        self.timer_label.config(text=f"Time: {self.session.elapsed():.1f}s")
+
+    def start_timer(self):
+        self.timer_label.config(text="Time: 0.0s")
+        self.animator.every("timer", TIMER_INTERVAL, self.update_timer)
+
+    def stop_timer(self):
+        self.animator.cancel("timer")
+
+    # --- Game Logic (see game_engine.py) ---
+    def check_guess(self, event=None):
+        session = self.session
+        if not session.active:
+            return
+        try:
+            number = int(self.entry.get())
+        except ValueError:
+            self.feedback.config(text="Please enter a valid number.")
+            self.animate_feedback(FEEDBACK_COLORS["error"])
             beep_wrong()
+            self.entry.delete(0, tk.END)
             return
-        if guess_count == 0:
-            start_timer()
-        guess_count += 1
-        guesses.append(guess)
-        counter_label.config(text=f"Attempts: {guess_count}")
-        history_label.config(text="Previous guesses: " + ", ".join(str(g) for g in guesses))
-        diff = abs(guess - secret_number)
-        emoji = ""
-        if guess == secret_number:
-            stop_timer()
-            elapsed = time.time() - start_time
-            feedback.config(text=f"🎉 Correct! You guessed it in {guess_count} attempts!\nTime: {elapsed:.1f}s")
-            animate_feedback(FEEDBACK_COLORS["correct"])
+        outcome = session.guess(number)
+        if outcome == OUT_OF_RANGE:
+            self.feedback.config(text=f"Enter a number between {session.low} and {session.high}.")
+            self.animate_feedback(FEEDBACK_COLORS["error"])
+            beep_wrong()
+            return
+        if session.attempts == 1:
+            self.start_timer()
+        self.counter_label.config(text=f"Attempts: {session.attempts}")
+        self.history.add(number, outcome)
+        if outcome == CORRECT:
+            self.stop_timer()
+            elapsed = session.elapsed()
+            self.feedback.config(text=f"🎉 Correct! You guessed it in {session.attempts} attempts!\nTime: {elapsed:.1f}s")
+            self.animate_feedback(FEEDBACK_COLORS["correct"])
             beep_correct()
-            entry.config(state="disabled")
-            check_button.config(state="disabled")
-            game_active = False
+            self.entry.config(state="disabled")
+            self.check_button.config(state="disabled")
             # High score logic
-            if best_score is None or guess_count < best_score or (guess_count == best_score and elapsed < best_time):
-                best_score = guess_count
-                best_time = elapsed
-                highscore_label.config(text=f"Best: {best_score} attempts, {best_time:.1f} s")
+            if self.best.record(session.attempts, elapsed):
+                self.show_best()
+            if self.leaderboard is not None:
+                share = self.leaderboard.percentile(session.attempts, elapsed, session.lowest, session.highest)
+                if share is not None:
+                    self.feedback.config(text=self.feedback.cget("text") + f"\nBetter than {share:.0f}% of games")
+                self.leaderboard.record(self.player, session)
             # Confetti (simple emoji)
-            for i in range(10):
-                root.after(i*80, lambda: feedback.config(text=feedback.cget("text") + " 🎊"))
-        elif diff <= 5:
-            hint = "Too low!" if guess < secret_number else "Too high!"
-            emoji = "🔥"
-            feedback.config(text=f"{hint} But you're very close! {emoji}")
-            animate_feedback(FEEDBACK_COLORS["close"])
-            beep_wrong()
-            # Update range
-            if guess < secret_number and guess+1 > min_range:
-                min_range = guess+1
-            elif guess > secret_number and guess-1 < max_range:
-                max_range = guess-1
-        elif guess < secret_number:
-            feedback.config(text="Too low! Try again. 😅")
-            animate_feedback(FEEDBACK_COLORS["low"])
-            beep_wrong()
-            if guess+1 > min_range:
-                min_range = guess+1
+            self.confetti()
         else:
-            feedback.config(text="Too high! Try again. 🤔")
-            animate_feedback(FEEDBACK_COLORS["high"])
+            hint, color = HINTS[outcome]
+            self.feedback.config(text=hint)
+            self.animate_feedback(FEEDBACK_COLORS[color])
             beep_wrong()
-            if guess-1 < max_range:
-                max_range = guess-1
-        range_hint.config(text=f"Range: {min_range} - {max_range}")
-    except ValueError:
-        feedback.config(text="Please enter a valid number.")
-        animate_feedback(FEEDBACK_COLORS["error"])
-        beep_wrong()
-    entry.delete(0, tk.END)
-
-def reset_game():
-    global secret_number, guess_count, game_active, guesses, min_range, max_range, start_time
-    secret_number = random.randint(1, 100)
-    guess_count = 0
-    game_active = True
-    guesses = []
-    min_range = 1
-    max_range = 100
-    feedback.config(text="Game reset! Guess a number between 1 and 100.")
-    animate_feedback(FEEDBACK_COLORS["error"])
-    counter_label.config(text="Attempts: 0")
-    entry.config(state="normal")
-    check_button.config(state="normal")
-    entry.delete(0, tk.END)
-    entry.focus_set()
-    range_hint.config(text="Range: 1 - 100")
-    history_label.config(text="Previous guesses: ")
-    stop_timer()
-    timer_label.config(text="Time: 0.0s")
-    start_time = None
-
-# --- Buttons ---
-button_frame = tk.Frame(root, bg=BG_COLOR)
-button_frame.pack(pady=10)
-
-check_button = tk.Button(
-    button_frame,
-    text="Check",
-    command=check_guess,
-    font=("Arial", 12, "bold"),
-    bg=BTN_BG,
-    fg=BTN_FG,
-    activebackground=BTN_FG,
-    activeforeground=BTN_BG,
-    relief=tk.RAISED,
-    bd=2,
-    width=10
-)
-check_button.grid(row=0, column=0, padx=5)
-
-reset_button = tk.Button(
-    button_frame,
-    text="Reset",
-    command=reset_game,
-    font=("Arial", 12, "bold"),
-    bg="#6272a4",
-    fg=BTN_FG,
-    activebackground=BTN_FG,
-    activeforeground="#6272a4",
-    relief=tk.RAISED,
-    bd=2,
-    width=10
-)
-reset_button.grid(row=0, column=1, padx=5)
-
-# --- Bindings ---
-entry.bind("<Return>", check_guess)
-
-# --- Focus entry on start ---
-entry.focus_set()
-
-# --- Start the Tkinter event loop ---
-root.mainloop()
\ No newline at end of file
+        self.range_hint.config(text=f"Range: {session.low} - {session.high}")
+        self.entry.delete(0, tk.END)
+
+    def reset_game(self):
+        session = self.session
+        session.reset()
+        self.animator.cancel("confetti")
+        self.feedback.config(text=f"Game reset! Guess a number between {session.lowest} and {session.highest}.")
+        self.animate_feedback(FEEDBACK_COLORS["error"])
+        self.counter_label.config(text="Attempts: 0")
+        self.entry.config(state="normal")
+        self.check_button.config(state="normal")
+        self.entry.delete(0, tk.END)
+        self.entry.focus_set()
+        self.range_hint.config(text=f"Range: {session.low} - {session.high}")
+        self.history.clear()
+        self.stop_timer()
+        self.timer_label.config(text="Time: 0.0s")
+
+
+# --- Main Window ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Number Guessing Game")
+    parser.add_argument("--player", default=getpass.getuser(), help="name on the leaderboard")
+    parser.add_argument("--db", default=DB_FILE, help="leaderboard database")
+    args = parser.parse_args(argv)
+
+    leaderboard = Leaderboard(args.db)
+    root = tk.Tk()
+    root.title("Number Guessing Game")
+    root.geometry("440x520")
+    root.configure(bg=BG_COLOR)
+    GameView(root, leaderboard=leaderboard, player=args.player)
+
+    def close():
+        leaderboard.close()  # waits for the last game to be written
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", close)
+    # --- Start the Tkinter event loop ---
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import sys
+import queue
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+from game_engine import LOWEST, HIGHEST
+
+# 🏆 Persistent leaderboard and game history
+#
+#   board = Leaderboard("scores.db")
+#   board.record("ana", session)          # returns at once, written in the background
+#   board.top(10)                         # best games: fewest attempts, then fastest
+#   board.player("ana")                   # games, best, average for one player
+#   board.percentile(6, 12.5)             # % of games this result beats
+#
+#   python leaderboard.py top | players | player NAME | percentile ATTEMPTS SECONDS
+#
+# Every finished game is a row of `games` (player, range, secret, guesses,
+# attempts, seconds). Results only compare within the same range, and every
+# query is answered from an index or from two small summary tables kept up to
+# date as games are written:
+#
+#   attempt_counts   games per (range, attempts): percentiles without a scan
+#   players          per (player, range): games, total attempts, best result
+#
+# so top-N, per-player and percentile queries stay fast at millions of games.
+#
+# record() only queues the game. One writer thread with its own connection
+# writes whatever has queued up in a single transaction (up to MAX_BATCH
+# games), so saving a result never blocks the window. Reads use the caller's
+# connection; with WAL they never wait for the writer. flush() waits until
+# everything queued so far is written, close() also stops the writer.
+
+DB_FILE = "scores.db"
+MAX_BATCH = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    played_at TEXT NOT NULL,
+    lowest INTEGER NOT NULL,
+    highest INTEGER NOT NULL,
+    secret INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    guesses TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_rank ON games(lowest, highest, attempts, seconds);
+CREATE INDEX IF NOT EXISTS games_player ON games(player, id);
+CREATE TABLE IF NOT EXISTS attempt_counts (
+    lowest INTEGER NOT NULL,
+    highest INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (lowest, highest, attempts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT NOT NULL,
+    lowest INTEGER NOT NULL,
+    highest INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    total_attempts INTEGER NOT NULL,
+    best_attempts INTEGER NOT NULL,
+    best_seconds REAL NOT NULL,
+    PRIMARY KEY (player, lowest, highest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_rank ON players(lowest, highest, best_attempts, best_seconds);
+"""
+
+
+def _connect(path):
+    db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+def game_row(player, session, played_at=None):
+    # The `games` row for a finished GameSession.
+    return (player, played_at or datetime.now().isoformat(timespec='seconds'), session.lowest,
+            session.highest, session.secret, session.attempts, round(session.elapsed(), 3),
+            ",".join(map(str, session.guesses)))
+
+
+class Leaderboard:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.db = _connect(path)
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
+    # ✍️ Writes (background)
+    def record(self, player, session, played_at=None):
+        self._queue.put([game_row(player, session, played_at)])
+
+    def record_many(self, rows):
+        # Bulk load of game_row() tuples, e.g. from a simulation.
+        rows = list(rows)
+        for start in range(0, len(rows), MAX_BATCH):
+            self._queue.put(rows[start:start + MAX_BATCH])
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        self.db.close()
+
+    def _run(self):
+        db = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            rows = [row for item in batch if item is not None for row in item]
+            try:
+                if rows:
+                    with db:
+                        _write(db, rows)
+            except sqlite3.Error as e:
+                print(f"leaderboard: could not save {len(rows)} games: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                db.close()
+                return
+
+    # 🔎 Queries (range defaults to the game's)
+    def top(self, n=10, lowest=LOWEST, highest=HIGHEST):
+        rows = self.db.execute(
+            "SELECT player, attempts, seconds, played_at FROM games WHERE lowest = ? AND highest = ? "
+            "ORDER BY attempts, seconds LIMIT ?", (lowest, highest, n))
+        return [dict(zip(('player', 'attempts', 'seconds', 'played_at'), row)) for row in rows]
+
+    def top_players(self, n=10, lowest=LOWEST, highest=HIGHEST):
+        rows = self.db.execute(
+            "SELECT player, best_attempts, best_seconds, games, total_attempts FROM players "
+            "WHERE lowest = ? AND highest = ? ORDER BY best_attempts, best_seconds LIMIT ?",
+            (lowest, highest, n))
+        return [{'player': player, 'best_attempts': attempts, 'best_seconds': seconds, 'games': games,
+                 'average_attempts': total / games}
+                for player, attempts, seconds, games, total in rows]
+
+    def player(self, player, lowest=LOWEST, highest=HIGHEST):
+        # None if the player has no games in this range.
+        row = self.db.execute(
+            "SELECT games, total_attempts, best_attempts, best_seconds FROM players "
+            "WHERE player = ? AND lowest = ? AND highest = ?", (player, lowest, highest)).fetchone()
+        if row is None:
+            return None
+        games, total, attempts, seconds = row
+        return {'player': player, 'games': games, 'average_attempts': total / games,
+                'best_attempts': attempts, 'best_seconds': seconds}
+
+    def history(self, player, n=20):
+        # The player's most recent games, newest first.
+        rows = self.db.execute(
+            "SELECT played_at, lowest, highest, secret, attempts, seconds, guesses FROM games "
+            "WHERE player = ? ORDER BY id DESC LIMIT ?", (player, n))
+        return [{'played_at': played_at, 'lowest': lowest, 'highest': highest, 'secret': secret,
+                 'attempts': attempts, 'seconds': seconds, 'guesses': [int(g) for g in guesses.split(",")]}
+                for played_at, lowest, highest, secret, attempts, seconds, guesses in rows]
+
+    def percentile(self, attempts, seconds, lowest=LOWEST, highest=HIGHEST):
+        # Share of recorded games (0-100) that this result beats: more
+        # attempts, or as many and slower. None with no games yet.
+        counts = self.db.execute(
+            "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(CASE WHEN attempts > ? THEN games END), 0) "
+            "FROM attempt_counts WHERE lowest = ? AND highest = ?", (attempts, lowest, highest)).fetchone()
+        total, worse = counts
+        if not total:
+            return None
+        slower, = self.db.execute(
+            "SELECT COUNT(*) FROM games WHERE lowest = ? AND highest = ? AND attempts = ? AND seconds > ?",
+            (lowest, highest, attempts, seconds)).fetchone()
+        return (worse + slower) / total * 100
+
+    def attempts_at(self, fraction, lowest=LOWEST, highest=HIGHEST):
+        # Fewest attempts that `fraction` (0-1) of the games needed at most.
+        rows = self.db.execute(
+            "SELECT attempts, games FROM attempt_counts WHERE lowest = ? AND highest = ? ORDER BY attempts",
+            (lowest, highest)).fetchall()
+        wanted = fraction * sum(games for _, games in rows)
+        seen = 0
+        for attempts, games in rows:
+            seen += games
+            if seen >= wanted:
+                return attempts
+        return None
+
+
+def _write(db, rows):
+    db.executemany(
+        "INSERT INTO games (player, played_at, lowest, highest, secret, attempts, seconds, guesses) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    # Fold the batch into the summary tables: one upsert per distinct key.
+    counts = {}
+    players = {}
+    for player, _, lowest, highest, _, attempts, seconds, _ in rows:
+        key = (lowest, highest, attempts)
+        counts[key] = counts.get(key, 0) + 1
+        key = (player, lowest, highest)
+        games, total, best = players.get(key, (0, 0, (attempts, seconds)))
+        players[key] = (games + 1, total + attempts, min(best, (attempts, seconds)))
+    db.executemany(
+        "INSERT INTO attempt_counts VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (lowest, highest, attempts) DO UPDATE SET games = games + excluded.games",
+        [key + (n,) for key, n in counts.items()])
+    db.executemany(
+        "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (player, lowest, highest) DO UPDATE SET games = games + excluded.games, "
+        "total_attempts = total_attempts + excluded.total_attempts, "
+        "best_seconds = CASE WHEN (excluded.best_attempts, excluded.best_seconds) < (best_attempts, best_seconds) "
+        "THEN excluded.best_seconds ELSE best_seconds END, "
+        "best_attempts = MIN(best_attempts, excluded.best_attempts)",
+        [key + (games, total) + best for key, (games, total, best) in players.items()])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guessing game leaderboard")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--range", default=f"{LOWEST}-{HIGHEST}", help="e.g. 1-100")
+    parser.add_argument("-n", type=int, default=10, help="rows to show")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("top", help="best games")
+    commands.add_parser("players", help="best players")
+    player = commands.add_parser("player", help="one player's results and recent games")
+    player.add_argument("name")
+    percentile = commands.add_parser("percentile", help="how a result compares")
+    percentile.add_argument("attempts", type=int)
+    percentile.add_argument("seconds", type=float)
+    args = parser.parse_args(argv)
+
+    lowest, _, highest = args.range.partition("-")
+    lowest, highest = int(lowest), int(highest)
+    board = Leaderboard(args.db)
+    try:
+        if args.command == "top":
+            for rank, game in enumerate(board.top(args.n, lowest, highest), 1):
+                print(f"{rank:>3}. {game['player']:<16} {game['attempts']:>3} attempts {game['seconds']:>8.1f}s"
+                      f"  {game['played_at']}")
+        elif args.command == "players":
+            for rank, p in enumerate(board.top_players(args.n, lowest, highest), 1):
+                print(f"{rank:>3}. {p['player']:<16} best {p['best_attempts']:>3} attempts "
+                      f"{p['best_seconds']:>8.1f}s  {p['games']:>7,} games, average {p['average_attempts']:.2f}")
+        elif args.command == "player":
+            stats = board.player(args.name, lowest, highest)
+            if stats is None:
+                print(f"no games for {args.name} in {lowest}-{highest}")
+                return 1
+            print(f"{args.name}: {stats['games']:,} games, best {stats['best_attempts']} attempts "
+                  f"in {stats['best_seconds']:.1f}s, average {stats['average_attempts']:.2f} attempts")
+            for game in board.history(args.name, args.n):
+                print(f"  {game['played_at']}  {game['attempts']:>3} attempts {game['seconds']:>7.1f}s  "
+                      f"{game['lowest']}-{game['highest']}: {', '.join(map(str, game['guesses']))}")
+        else:
+            share = board.percentile(args.attempts, args.seconds, lowest, highest)
+            if share is None:
+                print("no games recorded yet")
+                return 1
+            print(f"{args.attempts} attempts in {args.seconds:.1f}s beats {share:.1f}% of games")
+    finally:
+        board.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
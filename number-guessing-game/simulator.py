@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import time
+import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_engine import LOWEST, HIGHEST, CLOSE_DISTANCE
+
+# 🧪 Batch simulator and strategy evaluator
+#
+#   python simulator.py --games 1000000
+#   python simulator.py --range 1-1000 --strategies bisect,close --workers 4
+#   python simulator.py --exhaustive --games 100 --output results.json
+#
+# Plays many games at once as NumPy arrays: one array per piece of game state
+# (secret, range still possible, attempts), one vectorized step per round,
+# and finished games are dropped from the arrays as they win. The step
+# applies the rules of GameSession.guess() (game_engine.py): a counted guess
+# narrows the range to the side of the secret, and a wrong guess within
+# CLOSE_DISTANCE is "very close". Strategies only ever guess inside the
+# range, so no guess is out of range.
+#
+# Strategies:
+#   bisect   the middle of the range
+#   random   any number in the range, uniformly
+#   close    the middle of what is actually known: a "very close" hint puts
+#            the secret within CLOSE_DISTANCE of the guess, and a plain
+#            low/high hint puts it further away than that
+#   optimal  like close, but guesses where the expected number of attempts
+#            is lowest, from a table solved once per range (up to
+#            OPTIMAL_LIMIT numbers)
+#
+# Games are split into chunks of CHUNK_GAMES; with several workers the chunks
+# run in a process pool, each with its own random stream, and only the
+# attempt histograms come back.
+
+STRATEGIES = ('bisect', 'random', 'close', 'optimal')
+CHUNK_GAMES = 250_000
+OPTIMAL_LIMIT = 20_000
+
+
+# 🎯 Strategies: STRATEGY_FUNCTIONS[name](lowest, highest) returns a function
+# (known low, known high, range low, range high, rng) -> guesses
+def _bisect(lowest, highest):
+    return lambda known_low, known_high, low, high, rng: (low + high) // 2
+
+
+def _random(lowest, highest):
+    return lambda known_low, known_high, low, high, rng: rng.integers(low, high + 1)
+
+
+def _close(lowest, highest):
+    return lambda known_low, known_high, low, high, rng: (known_low + known_high) // 2
+
+
+@lru_cache(maxsize=None)
+def optimal_offsets(size):
+    # offsets[n]: where to guess in a known interval of n numbers, counted
+    # from its low end. total[n] is the least sum of attempts over the n
+    # possible secrets; a guess at p splits the rest into up to four
+    # intervals: far below, close below, close above and far above.
+    if size > OPTIMAL_LIMIT:
+        raise ValueError(f"the optimal strategy is limited to ranges of {OPTIMAL_LIMIT:,} numbers, "
+                         "use 'close' instead")
+    total = np.zeros(size + 1, dtype=np.int64)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    for n in range(1, size + 1):
+        p = np.arange(n)
+        close_below = np.minimum(p, CLOSE_DISTANCE)
+        close_above = np.minimum(n - 1 - p, CLOSE_DISTANCE)
+        cost = (total[p - close_below] + total[close_below]
+                + total[close_above] + total[n - 1 - p - close_above])
+        best = int(np.argmin(cost))
+        offsets[n] = best
+        total[n] = n + cost[best]
+    return offsets
+
+
+def _optimal(lowest, highest):
+    offsets = optimal_offsets(highest - lowest + 1)
+    return lambda known_low, known_high, low, high, rng: known_low + offsets[known_high - known_low + 1]
+
+
+STRATEGY_FUNCTIONS = {
+    'bisect': _bisect,
+    'random': _random,
+    'close': _close,
+    'optimal': _optimal,
+}
+
+
+# 🎲 Playing
+def play_batch(secrets, strategy, rng, lowest=LOWEST, highest=HIGHEST):
+    # Attempts each game took, in the order of `secrets`.
+    choose = STRATEGY_FUNCTIONS[strategy](lowest, highest)
+    count = len(secrets)
+    result = np.zeros(count, dtype=np.int32)
+    games = np.arange(count)
+    secret = np.asarray(secrets, dtype=np.int64)
+    low = np.full(count, lowest, dtype=np.int64)
+    high = np.full(count, highest, dtype=np.int64)
+    known_low = low.copy()
+    known_high = high.copy()
+    attempts = 1
+    while games.size:
+        guess = choose(known_low, known_high, low, high, rng)
+        diff = secret - guess
+        won = diff == 0
+        result[games[won]] = attempts
+        playing = ~won
+        if not playing.any():
+            break
+        games, secret, guess, diff = games[playing], secret[playing], guess[playing], diff[playing]
+        low, high = low[playing], high[playing]
+        known_low, known_high = known_low[playing], known_high[playing]
+        too_low = diff > 0
+        close = np.abs(diff) <= CLOSE_DISTANCE
+        # The game's range, exactly as GameSession narrows it.
+        low = np.where(too_low, guess + 1, low)
+        high = np.where(too_low, high, guess - 1)
+        # What the hint says on top of that: within CLOSE_DISTANCE of the
+        # guess if "very close", further away than that if not.
+        known_low = np.maximum(low, np.where(
+            too_low, np.where(close, guess + 1, guess + CLOSE_DISTANCE + 1),
+            np.where(close, np.maximum(known_low, guess - CLOSE_DISTANCE), known_low)))
+        known_high = np.minimum(high, np.where(
+            too_low, np.where(close, np.minimum(known_high, guess + CLOSE_DISTANCE), known_high),
+            np.where(close, guess - 1, guess - CLOSE_DISTANCE - 1)))
+        attempts += 1
+    return result
+
+
+def draw_secrets(rng, games, lowest, highest, exhaustive, start=0):
+    # Uniform secrets, or every number in turn (game `start` onwards).
+    if exhaustive:
+        return lowest + (np.arange(start, start + games) % (highest - lowest + 1))
+    return rng.integers(lowest, highest + 1, size=games)
+
+
+def _run_chunk(args):
+    strategy, games, start, lowest, highest, exhaustive, seed = args
+    rng = np.random.default_rng(seed)
+    secrets = draw_secrets(rng, games, lowest, highest, exhaustive, start)
+    return np.bincount(play_batch(secrets, strategy, rng, lowest, highest))
+
+
+def simulate(strategy, games, lowest=LOWEST, highest=HIGHEST, exhaustive=False, seed=None, pool=None):
+    # Histogram of attempts: counts[n] games took n attempts.
+    if strategy not in STRATEGY_FUNCTIONS:
+        raise ValueError(f"unknown strategy {strategy!r}, use {', '.join(STRATEGIES)}")
+    if strategy == 'optimal':
+        optimal_offsets(highest - lowest + 1)  # fail early for too large a range
+    starts = range(0, games, CHUNK_GAMES)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    chunks = [(strategy, min(CHUNK_GAMES, games - start), start, lowest, highest, exhaustive, chunk_seed)
+              for start, chunk_seed in zip(starts, seeds)]
+    parts = pool.map(_run_chunk, chunks) if pool is not None else map(_run_chunk, chunks)
+    counts = np.zeros(1, dtype=np.int64)
+    for part in parts:
+        if len(part) > len(counts):
+            counts = np.pad(counts, (0, len(part) - len(counts)))
+        counts[:len(part)] += part
+    return counts
+
+
+# 📋 Reports
+def summarize(counts):
+    attempts = np.arange(len(counts))
+    games = int(counts.sum())
+    cumulative = np.cumsum(counts)
+
+    def percentile(fraction):
+        return int(np.searchsorted(cumulative, fraction * games))
+
+    return {
+        'games': games,
+        'mean': float((attempts * counts).sum() / games),
+        'p50': percentile(0.5),
+        'p90': percentile(0.9),
+        'p99': percentile(0.99),
+        'max': int(attempts[counts > 0].max()),
+        'distribution': {int(n): int(c) for n, c in enumerate(counts) if c},
+    }
+
+
+def report(results, lowest, highest):
+    lines = [f"range {lowest}-{highest}"]
+    lines.append(f"{'strategy':10} {'games':>11} {'mean':>7} {'p50':>4} {'p90':>4} {'p99':>4} {'max':>4} "
+                 f"{'games/s':>12}")
+    for name, result in results.items():
+        lines.append(f"{name:10} {result['games']:>11,} {result['mean']:>7.3f} {result['p50']:>4} "
+                     f"{result['p90']:>4} {result['p99']:>4} {result['max']:>4} "
+                     f"{result['games_per_second']:>12,.0f}")
+    longest = max(result['max'] for result in results.values())
+    lines.append("")
+    lines.append("attempts " + "".join(f"{name:>10}" for name in results) + "   (% of games)")
+    for n in range(1, longest + 1):
+        row = [result['distribution'].get(n, 0) / result['games'] * 100 for result in results.values()]
+        lines.append(f"{n:>8} " + "".join(f"{share:>10.3f}" for share in row))
+    return "\n".join(lines)
+
+
+def parse_range(text):
+    lowest, _, highest = text.partition('-')
+    lowest, highest = int(lowest), int(highest)
+    if lowest > highest:
+        raise ValueError(f"empty range {text!r}")
+    return lowest, highest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate guessing strategies")
+    parser.add_argument("--games", type=int, default=1_000_000, help="games per strategy")
+    parser.add_argument("--range", default=f"{LOWEST}-{HIGHEST}", help="secret range, e.g. 1-1000")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="cycle through every secret instead of drawing them at random")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes to use")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    try:
+        lowest, highest = parse_range(args.range)
+    except ValueError as e:
+        parser.error(str(e))
+    results = {}
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    try:
+        for strategy in args.strategies.split(","):
+            started = time.perf_counter()
+            try:
+                counts = simulate(strategy, args.games, lowest, highest, args.exhaustive, args.seed, pool)
+            except ValueError as e:
+                print(f"{strategy}: {e}", file=sys.stderr)
+                continue
+            results[strategy] = summarize(counts)
+            results[strategy]['games_per_second'] = args.games / (time.perf_counter() - started)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not results:
+        return 1
+    print(report(results, lowest, highest))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'range': [lowest, highest], 'exhaustive': args.exhaustive, 'results': results}, f,
+                      indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
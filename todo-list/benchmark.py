@@ -0,0 +1,209 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import builtins
+import tempfile
+import statistics
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, timedelta
+
+import todo_list
+from task_model import Task, Priority, Status
+
+# ⏱️ Benchmarks for the todo-list core operations
+#
+#   python benchmark.py --sizes 1000,10000,100000 --storage journal --output bench.json
+#   python benchmark.py --sizes 1000 --compare bench.json
+#
+# Each size gets a synthetic tasks.json in a scratch directory. Every
+# operation runs --repeat times with input() scripted, output discarded and
+# sound/animations switched off; one extra run under tracemalloc records the
+# peak memory. Results are written as JSON, and --compare prints the ratio
+# against an earlier results file.
+#
+# Loading is timed twice: "load_tasks" removes tasks.cache before every run,
+# so it always parses tasks.json and replays the journal (a first start, or
+# one after tasks.json changed), while "load_tasks_cached" reads the warm
+# cache. The previous session is closed before the timer starts in both.
+
+CATEGORIES = [("Work", 35), ("Personal", 30), ("Study", 15), ("Shopping", 10), ("Health", 5), ("Other", 5)]
+PRIORITIES = [(Priority.HIGH, 20), (Priority.MEDIUM, 55), (Priority.LOW, 25)]
+STATUSES = [(Status.PENDING, 60), (Status.IN_PROGRESS, 15), (Status.COMPLETED, 25)]
+WORDS = ("call email review write plan buy fix clean read book pay send update prepare "
+         "report meeting groceries invoice doctor gym project draft slides budget car "
+         "laundry dinner tickets homework notes backup garden").split()
+BAD_DUE_RATE = 0.02  # blank or free-text dates, as add_task accepts anything
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def generate_tasks(n, seed=42):
+    rng = random.Random(seed)
+    today = date.today()
+    for _ in range(n):
+        if rng.random() < BAD_DUE_RATE:
+            due = rng.choice(["", "tomorrow", "next week"])
+        else:
+            # Most tasks are due within a few weeks of today, a tail far out.
+            due = (today + timedelta(days=int(rng.gauss(7, 45)))).isoformat()
+        yield Task(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))),
+            _weighted(rng, CATEGORIES),
+            due,
+            _weighted(rng, PRIORITIES),
+            _weighted(rng, STATUSES),
+        )
+
+
+def write_dataset(path, n, seed=42):
+    with open(path, 'w') as f:
+        json.dump([t.to_dict() for t in generate_tasks(n, seed)], f)
+
+
+@contextmanager
+def scripted_input(*answers):
+    # Remaining prompts (e.g. the pager) get an empty answer.
+    queue = list(answers)
+    original = builtins.input
+    builtins.input = lambda prompt='': queue.pop(0) if queue else ''
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def close_store():
+    if todo_list.store is not None:
+        todo_list.close_tasks()
+
+
+def cold_start():
+    close_store()
+    cache_path = os.path.splitext(todo_list.TASK_FILE)[0] + '.cache'
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+# 🧪 Operations: name -> (answers for input(), callable, untimed setup or None)
+def operations():
+    return [
+        ("load_tasks", (), lambda: todo_list.load_tasks(), cold_start),
+        ("load_tasks_cached", (), lambda: todo_list.load_tasks(), close_store),
+        ("show_tasks", (), lambda: todo_list.show_tasks(todo_list.store.tasks), None),
+        ("search_tasks", ("review report",), lambda: todo_list.search_tasks(todo_list.store.tasks), None),
+        ("filter_by_category", ("Study",), lambda: todo_list.filter_by_category(todo_list.store.tasks), None),
+        ("show_stats", (), lambda: todo_list.show_stats(todo_list.store.tasks), None),
+        ("sort_tasks", ("1",), lambda: todo_list.sort_tasks(todo_list.store.tasks), None),
+        ("export_to_csv", ("export.csv",), lambda: todo_list.export_to_csv(todo_list.store.tasks), None),
+        ("save_tasks", (), lambda: todo_list.save_tasks(todo_list.store.tasks), None),
+    ]
+
+
+def run_once(answers, func, setup=None):
+    with scripted_input(*answers), redirect_stdout(io.StringIO()):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        return time.perf_counter() - started
+
+
+def bench_size(n, repeat, storage):
+    results = []
+    workdir = tempfile.mkdtemp(prefix=f"todo-bench-{n}-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        started = time.perf_counter()
+        write_dataset(todo_list.TASK_FILE, n)
+        print(f"  generated {n:,} tasks in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        todo_list.settings["storage"] = storage
+        todo_list.load_tasks()
+        for name, answers, func, setup in operations():
+            timings = [run_once(answers, func, setup) for _ in range(repeat)]
+            if setup is not None:
+                setup()
+            tracemalloc.start()
+            run_once(answers, func)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result = {
+                'size': n,
+                'op': name,
+                'seconds': timings,
+                'median': statistics.median(timings),
+                'min': min(timings),
+                'peak_bytes': peak,
+            }
+            results.append(result)
+            print(f"  {name:<20} median {result['median'] * 1000:10.2f} ms   "
+                  f"peak {peak / 1024 / 1024:8.2f} MiB", file=sys.stderr)
+        todo_list.close_tasks()
+        todo_list.store = None
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['size'], r['op']): r for r in json.load(f)['results']}
+    print(f"\n{'size':>9} {'operation':<20} {'before ms':>11} {'after ms':>11} {'ratio':>7}")
+    for r in results:
+        old = baseline.get((r['size'], r['op']))
+        if old is None:
+            continue
+        ratio = r['median'] / old['median'] if old['median'] else float('inf')
+        print(f"{r['size']:>9,} {r['op']:<20} {old['median'] * 1000:>11.2f} "
+              f"{r['median'] * 1000:>11.2f} {ratio:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the todo-list core operations")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma separated task counts (default: %(default)s)")
+    parser.add_argument("--storage", choices=("journal", "sqlite"), default="journal")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="OLD_RESULTS", help="print ratios against an earlier run")
+    args = parser.parse_args(argv)
+
+    # No sounds or animation ticks while timing.
+    todo_list.feedback.sound = False
+    todo_list.feedback.animations = False
+
+    results = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        print(f"{n:,} tasks ({args.storage})", file=sys.stderr)
+        results.extend(bench_size(n, args.repeat, args.storage))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'storage': args.storage,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
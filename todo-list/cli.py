@@ -0,0 +1,272 @@
+import sys
+import shlex
+import argparse
+from itertools import islice
+
+import todo_list
+from task_model import Task, Status, parse_priority, parse_status
+from task_reminders import parse_repeat
+from task_metrics import metrics
+
+# ⌨️ Non-interactive command line
+#
+#   python todo_list.py add "Write report" --category Work --due 2025-08-01 --priority High
+#   python todo_list.py complete 12
+#   python todo_list.py list --category work
+#   python todo_list.py undo
+#   python todo_list.py --read-only list     (from the memory-mapped tasks.bin)
+#   python todo_list.py --file commands.txt     (one command per line, "-" for stdin)
+#   python todo_list.py serve --port 8765        (keep tasks loaded, see task_server.py)
+#   python todo_list.py --profile out.prof list  (cProfile the run, see task_metrics.py)
+#
+# Tasks are addressed by their stable id (first column of `list`). All
+# commands of one invocation run in a single process without animations or
+# sounds, inside one store batch, so the task store is written once at the end.
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="todo_list.py", description="To-Do List command line")
+    parser.add_argument("-f", "--file", help="run commands from FILE, one per line ('-' for stdin)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run under cProfile, save the stats to FILE and print the slowest calls")
+    commands = parser.add_subparsers(dest="command")
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("task")
+    add.add_argument("--category", default="Other")
+    add.add_argument("--due", default="")
+    add.add_argument("--priority", default="Medium")
+    add.add_argument("--repeat", default="", help="daily, weekly, monthly or yearly")
+
+    for name in ("complete", "delete"):
+        cmd = commands.add_parser(name, help=f"{name} a task")
+        cmd.add_argument("id", type=int)
+
+    edit = commands.add_parser("edit", help="change fields of a task")
+    edit.add_argument("id", type=int)
+    edit.add_argument("--task")
+    edit.add_argument("--category")
+    edit.add_argument("--due")
+    edit.add_argument("--priority")
+    edit.add_argument("--status")
+    edit.add_argument("--repeat", help="daily, weekly, monthly, yearly or none")
+
+    log = commands.add_parser("history", help="print recent history, newest first")
+    log.add_argument("--action")
+    log.add_argument("--task", help="task id or words from its name")
+    log.add_argument("--since", help="YYYY-MM-DD")
+    log.add_argument("-n", type=int, default=20, help="number of entries (default: %(default)s)")
+
+    show = commands.add_parser("list", help="print tasks, tab separated")
+    show.add_argument("--category")
+    show.add_argument("--sort", help="fields to sort by, e.g. priority,due,category:desc; a spec starting "
+                                     "with '-' needs --sort=-due (the stored order is kept)")
+
+    search = commands.add_parser("search", help="search task titles (word prefixes, OR)")
+    search.add_argument("query", nargs="+")
+
+    commands.add_parser("stats", help="print statistics")
+    commands.add_parser("reminders", help="print tasks due today or newly overdue")
+
+    export = commands.add_parser("export", help="export tasks to CSV")
+    export.add_argument("path", nargs="?")
+
+    load = commands.add_parser("import", help="import tasks from CSV/JSONL")
+    load.add_argument("path")
+
+    commands.add_parser("undo", help="undo the last change")
+    commands.add_parser("redo", help="redo the last undone change")
+
+    serve = commands.add_parser("serve", help="serve tasks over HTTP until interrupted")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, help="TCP port (default: server_port setting)")
+    serve.add_argument("--socket", help="listen on this Unix socket instead of a TCP port")
+    serve.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    return parser
+
+
+def print_tasks(tasks):
+    for t in tasks:
+        print("\t".join([str(t.id), t.task, t.category, t.due, t.priority.label, t.status.label]))
+
+
+CHANGING_COMMANDS = {"add", "complete", "delete", "edit", "import", "undo", "redo"}
+
+
+def run_command(args):
+    store = todo_list.store
+    if store.read_only and args.command in CHANGING_COMMANDS:
+        raise ValueError(f"{args.command} is not available in read-only mode")
+    if args.command == "add":
+        task = store.add(Task(args.task, args.category.capitalize(), args.due,
+                              parse_priority(args.priority),
+                              repeat=parse_repeat(args.repeat)))
+        todo_list.log_history("Added", task)
+        print(f"added {task.id}")
+    elif args.command in ("complete", "delete", "edit"):
+        try:
+            index = store.index_of(args.id)
+        except KeyError:
+            raise ValueError(f"no task with id {args.id}") from None
+        if args.command == "complete":
+            todo_list.log_history("Completed", store.tasks[index])
+            store.update(index, {'status': Status.COMPLETED})
+        elif args.command == "delete":
+            todo_list.log_history("Deleted", store.tasks[index])
+            store.delete(index)
+        else:
+            fields = {name: getattr(args, name) for name in ('task', 'category', 'due')
+                      if getattr(args, name) is not None}
+            if args.priority is not None:
+                fields['priority'] = parse_priority(args.priority)
+            if args.status is not None:
+                fields['status'] = parse_status(args.status)
+            if args.repeat is not None:
+                fields['repeat'] = parse_repeat(args.repeat)
+            store.update(index, fields)
+            todo_list.log_history("Edited", store.tasks[index])
+    elif args.command == "history":
+        task = args.task or ""
+        entries = todo_list.history.query(
+            action=args.action,
+            task_id=int(task) if task.isdigit() else None,
+            text=task if task and not task.isdigit() else None,
+            since=args.since,
+        )
+        for entry in islice(entries, args.n):
+            print("\t".join([entry['t'], entry['action'], str(entry['id'] or ""), entry['task']]))
+    elif args.command == "list":
+        if args.sort:
+            rows = todo_list.sorted_views.view(args.sort)
+            if args.category:
+                category = args.category.capitalize()
+                rows = (t for t in rows if t.category.capitalize() == category)
+        else:
+            rows = store.filter_by_category(args.category) if args.category else store.tasks
+        print_tasks(rows)
+    elif args.command == "search":
+        query = " ".join(args.query)
+        if store.read_only:
+            print_tasks(store.search(query))
+        else:
+            print_tasks(store.get(i) for i in sorted(todo_list.search_index.search(query)))
+    elif args.command == "stats":
+        stats = todo_list.task_stats.summary()
+        print(f"Total: {stats['total']} | Completed: {stats['completed']} | Pending: {stats['pending']} "
+              f"| In-Progress: {stats['in_progress']} | Overdue: {stats['overdue']}")
+    elif args.command == "reminders":
+        if todo_list.reminders is None:
+            raise ValueError("reminders are not available in read-only mode")
+        for kind, task in todo_list.reminders.poll():
+            print("\t".join([kind, str(task.id), task.task, task.due]))
+    elif args.command == "export":
+        from task_io import export_csv
+        path = args.path or todo_list.settings["export_path"]
+        count, seconds = export_csv(store.tasks, path)
+        print(f"exported {count} tasks to {path} in {seconds:.2f}s")
+    elif args.command == "import":
+        from task_io import import_tasks, import_format_supported
+        if not import_format_supported(args.path):
+            raise ValueError("unsupported file type, use .csv or .jsonl (optionally .gz)")
+        report = import_tasks(store, args.path)
+        print(f"imported {report.imported} tasks, rejected {report.rejected} "
+              f"({report.rows_per_second:,.0f} rows/s)")
+        for error in report.errors:
+            print("  " + error, file=sys.stderr)
+    elif args.command in ("undo", "redo"):
+        label = getattr(todo_list.undo_log, args.command)()
+        if label is None:
+            raise ValueError(f"nothing to {args.command}")
+        print(f"{args.command}: {label}")
+
+
+def read_commands(parser, path):
+    f = sys.stdin if path == "-" else open(path)
+    with f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except SystemExit:
+                print(f"line {line_no}: could not parse {line!r}", file=sys.stderr)
+                yield line_no, None
+                continue
+            yield line_no, args
+
+
+def run(argv):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.file:
+        commands = read_commands(parser, args.file)
+    elif args.command:
+        commands = [(None, args)]
+    else:
+        parser.print_help()
+        return 2
+    if args.profile:
+        return profile(args.profile, run_commands, args, commands)
+    return run_commands(args, commands)
+
+
+def profile(path, fn, *args):
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        profiler.dump_stats(path)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+
+
+def run_commands(args, commands):
+    if args.command == "serve":
+        return serve(args)
+    failures = 0
+    todo_list.load_tasks()
+    store = todo_list.store
+    try:
+        with store.batch():
+            for line_no, command in commands:
+                if command is None:
+                    failures += 1
+                    continue
+                try:
+                    with metrics.timer("cli." + command.command):
+                        if store.read_only or command.command in ("undo", "redo"):
+                            run_command(command)
+                        else:
+                            # Each command is one undo step.
+                            with todo_list.undo_log.action(command.command.capitalize()):
+                                run_command(command)
+                            if todo_list.undo_log.overflowed:
+                                where = f"line {line_no}: " if line_no else ""
+                                print(f"{where}warning: {command.command} is too large to undo, "
+                                      "the undo history was cleared", file=sys.stderr)
+                except (ValueError, OSError) as e:
+                    where = f"line {line_no}: " if line_no else ""
+                    print(f"{where}error: {e}", file=sys.stderr)
+                    failures += 1
+    finally:
+        todo_list.close_tasks()
+    return 1 if failures else 0
+
+
+def serve(args):
+    from task_server import TaskService, serve as serve_tasks
+    settings = todo_list.settings
+    if settings["read_only"]:
+        print("error: serve is not available in read-only mode", file=sys.stderr)
+        return 2
+    todo_list.load_tasks()
+    service = TaskService(todo_list.store, todo_list.search_index, todo_list.task_stats,
+                          todo_list.undo_log, todo_list.history, todo_list.sorted_views,
+                          settings["server_commit_ms"])
+    try:
+        serve_tasks(service, args.host, args.port or settings["server_port"], args.socket, args.verbose)
+    finally:
+        todo_list.close_tasks()
+    return 0
@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+# 🔔 Non-blocking sound and animation feedback
+#
+# Sounds are handed to one background worker thread, so play() returns
+# immediately. While a sound is still waiting to be played, further play()
+# calls are dropped: a burst of actions gives one click, not a backlog.
+#
+# working() shows the "Adding task..." animation while the wrapped code runs:
+# dots are printed by a ticker thread every `interval * speed` seconds and
+# stop as soon as the work is done, so the animation never adds latency.
+#
+# playsound is imported by the worker the first time a sound is played, so
+# startup never waits for it.
+
+
+class Feedback:
+    def __init__(self, sound_file, sound=True, animations=True, speed=1.0, interval=0.4, dots=3):
+        self.sound_file = sound_file
+        self.sound = sound
+        self.animations = animations and speed > 0
+        self.interval = interval * speed
+        self.dots = dots
+        self._queue = queue.Queue()
+        self._sound_pending = threading.Event()
+        self._worker = None
+
+    # 🎵 Sound
+    def play(self):
+        if not self.sound or self._sound_pending.is_set():
+            return
+        self._sound_pending.set()
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='feedback', daemon=True)
+            self._worker.start()
+        self._queue.put(self._play_sound)
+
+    def _play_sound(self):
+        self._sound_pending.clear()
+        if os.path.exists(self.sound_file):
+            try:
+                from playsound import playsound
+                playsound(self.sound_file)
+            except Exception:
+                pass
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            job()
+
+    # 🔁 Animation
+    @contextmanager
+    def working(self, message):
+        print(message, end="", flush=True)
+        done = threading.Event()
+        printed = [0]
+        ticker = None
+        if self.animations:
+            ticker = threading.Thread(target=self._tick, args=(done, printed), daemon=True)
+            ticker.start()
+        try:
+            yield
+        finally:
+            done.set()
+            if ticker is not None:
+                ticker.join()
+            print("." * max(self.dots - printed[0], 0), flush=True)
+
+    def _tick(self, done, printed):
+        while not done.wait(self.interval):
+            print(".", end="", flush=True)
+            printed[0] += 1
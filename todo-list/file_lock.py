@@ -0,0 +1,57 @@
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 🔒 Cross-process file lock
+#
+# An exclusive lock on a small side file (tasks.lock). Every session takes it
+# around reading other sessions' changes and writing its own, so appends,
+# snapshots and compactions never interleave. The lock is re-entrant within
+# one session; threads are expected to be serialized by the caller.
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._depth = 0
+
+    def acquire(self):
+        if not self._depth:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                while True:
+                    try:
+                        # LK_LOCK gives up after ~10 seconds; keep waiting.
+                        msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if not self._depth:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
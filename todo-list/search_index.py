@@ -0,0 +1,207 @@
+import os
+import re
+import json
+from bisect import bisect_left, insort
+
+from task_store import StoreListener
+from task_metrics import metrics
+
+# 🔍 Inverted full-text index over task titles
+#
+# Titles are split into lower-case word tokens. Each token maps to the set of
+# task ids containing it, and a sorted vocabulary makes prefix lookups a
+# bisect instead of a scan. The index listens to the task store, so adding,
+# editing or deleting a task only touches that task's tokens.
+#
+# Query syntax: every word is a prefix ("stud" finds "studey"); words are
+# AND-ed together and "OR" separates alternatives:
+#
+#   buy milk          -> titles with a word starting "buy" and one starting "milk"
+#   gym OR run        -> titles with a word starting "gym" or "run"
+#
+# The index is saved to tasks.index.json on exit together with the store's
+# file fingerprint, and reused on the next start if the store is unchanged.
+# It is only read (or built) on the first search, so sessions that never
+# search do not pay for it; changes made before then are picked up by
+# building it from the tasks instead.
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+def parse_query(query):
+    # List of OR-ed groups, each a list of AND-ed prefixes.
+    groups = [[]]
+    for word in query.split():
+        if word == "OR":
+            groups.append([])
+        else:
+            groups[-1].extend(TOKEN_RE.findall(word.lower()))
+    return [terms for terms in groups if terms]
+
+
+def matches(groups, text):
+    # Same rules as SearchIndex.search, for a single title (no index needed).
+    if not groups:
+        return True
+    tokens = tokenize(text)
+    return any(all(any(token.startswith(term) for token in tokens) for term in terms)
+               for terms in groups)
+
+
+class SearchIndex(StoreListener):
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.doc_tokens = {}
+        self.fingerprint = None
+        self.dirty = False
+        self._deferred = None
+
+    def defer(self, path, store):
+        self._deferred = (path, store.fingerprint(), store)
+
+    def _ensure(self):
+        if self._deferred is not None:
+            path, fingerprint, store = self._deferred
+            self._deferred = None
+            if not self.load(path, fingerprint):
+                self.build(store.tasks)
+
+    def _missed(self):
+        # An event before the first search: the saved index no longer
+        # matches, and the tasks already include the change.
+        if self._deferred is None:
+            return False
+        path, _, store = self._deferred
+        self._deferred = (path, None, store)
+        return True
+
+    # 🏗️ Building
+    def build(self, tasks):
+        self.postings = {}
+        self.doc_tokens = {}
+        for task in tasks:
+            self._add(task.id, tokenize(task.task), keep_sorted=False)
+        self.vocabulary = sorted(self.postings)
+        self.dirty = True
+
+    def _add(self, task_id, tokens, keep_sorted=True):
+        self.doc_tokens[task_id] = tokens
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = {task_id}
+                if keep_sorted:
+                    insort(self.vocabulary, token)
+            else:
+                ids.add(task_id)
+
+    def _remove(self, task_id):
+        for token in self.doc_tokens.pop(task_id, ()):
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                self.vocabulary.pop(bisect_left(self.vocabulary, token))
+
+    # 👂 Store events
+    def on_add(self, task):
+        if self._missed():
+            return
+        self._add(task.id, tokenize(task.task))
+        self.dirty = True
+
+    def on_update(self, task, old):
+        if 'task' in old and old['task'] != task.task:
+            if self._missed():
+                return
+            self._remove(task.id)
+            self.on_add(task)
+
+    def on_delete(self, task, index):
+        if self._missed():
+            return
+        self._remove(task.id)
+        self.dirty = True
+
+    def on_reset(self, tasks, old_tasks):
+        if self._missed():
+            return
+        self.build(tasks)
+
+    # 🔎 Queries
+    def _prefix(self, prefix):
+        ids = set()
+        start = bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            ids |= self.postings[token]
+        return ids
+
+    def search(self, query):
+        self._ensure()
+        groups = parse_query(query)
+        if not groups:
+            return set(self.doc_tokens)
+        found = set()
+        for terms in groups:
+            # Rarest term first keeps the running intersection small.
+            candidates = sorted((self._prefix(term) for term in terms), key=len)
+            result = candidates[0]
+            for ids in candidates[1:]:
+                result = result & ids
+            found |= result
+        return found
+
+    # 💾 Persistence
+    def save(self, path, fingerprint):
+        if self._deferred is not None:
+            # Never used: the file on disk is as good as it gets.
+            return
+        if not self.dirty and fingerprint == self.fingerprint:
+            return
+        data = {
+            'fingerprint': fingerprint,
+            'postings': {token: sorted(ids) for token, ids in self.postings.items()},
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            metrics.add_io('index', written=f.tell())
+        os.replace(tmp_path, path)
+        self.fingerprint = fingerprint
+        self.dirty = False
+
+    def load(self, path, fingerprint):
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path) as f:
+                data = json.load(f)
+                metrics.add_io('index', read=f.tell())
+        except ValueError:
+            return False
+        if data.get('fingerprint') != fingerprint:
+            return False
+        self.postings = {}
+        self.doc_tokens = {}
+        for token, ids in data['postings'].items():
+            self.postings[token] = set(ids)
+            for task_id in ids:
+                self.doc_tokens.setdefault(task_id, set()).add(token)
+        self.vocabulary = sorted(self.postings)
+        self.fingerprint = fingerprint
+        self.dirty = False
+        return True
+
+
+def open_index(path, store):
+    index = SearchIndex()
+    index.defer(path, store)
+    store.subscribe(index)
+    return index
@@ -0,0 +1,253 @@
+import os
+import json
+import zlib
+import hashlib
+from datetime import datetime
+
+from task_model import Task
+from task_store import StoreListener
+from task_metrics import metrics
+
+# 💾 Incremental, deduplicated backups
+#
+#   backups/objects/ab/ab12...      chunk of tasks, one JSON object per line
+#   backups/objects/cd/cd34....z    the same, zlib-compressed
+#   backups/manifests/<time>.json   one generation: its chunk hashes in order
+#
+# The task list is cut into chunks at content-defined boundaries: a chunk
+# ends after a task whose id hashes to a boundary value, so adding, editing
+# or deleting a task only changes the chunk around it. Chunks are stored
+# under the SHA-256 of their contents and written once; a new generation is
+# a small manifest plus the chunks that actually changed. Chunks whose tasks
+# were not touched since the last backup (tracked through store events) are
+# not even re-serialized. The newest BACKUP_GENERATIONS manifests are kept
+# and chunks no longer referenced by any of them are removed.
+#
+# Restoring diffs a generation against the current tasks and applies only
+# the differences through the store (journal records, not a new snapshot),
+# either for the whole list or for one task.
+
+BACKUP_GENERATIONS = 10
+CHUNK_FACTOR = 64  # average tasks per chunk
+MAX_CHUNK = 4 * CHUNK_FACTOR
+
+
+def _boundary(task_id):
+    # Knuth multiplicative hash, so boundaries do not follow id order.
+    return ((task_id * 2654435761) & 0xffffffff) < 0x100000000 // CHUNK_FACTOR
+
+
+def _chunks(tasks):
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) >= MAX_CHUNK or (isinstance(task.id, int) and _boundary(task.id)):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _atomic_write(path, data):
+    metrics.add_io('backups', written=len(data))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BackupStore(StoreListener):
+    def __init__(self, root, generations=BACKUP_GENERATIONS, compress=True):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifests_dir = os.path.join(root, 'manifests')
+        self.generations_kept = generations
+        self.compress = compress
+        # Chunk hashes of the last backup by their task ids, and the ids
+        # changed since then.
+        self._known = {}
+        self._dirty = set()
+
+    # 🧱 Objects
+    def _object_path(self, digest):
+        base = os.path.join(self.objects_dir, digest[:2], digest)
+        if os.path.exists(base + '.z'):
+            return base + '.z'
+        if os.path.exists(base):
+            return base
+        return None
+
+    def _write_object(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        if self._object_path(digest) is not None:
+            return digest, False
+        path = os.path.join(self.objects_dir, digest[:2], digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.compress:
+            _atomic_write(path + '.z', zlib.compress(data))
+        else:
+            _atomic_write(path, data)
+        return digest, True
+
+    def _read_object(self, digest):
+        path = self._object_path(digest)
+        if path is None:
+            raise ValueError(f"backup chunk {digest[:12]} is missing")
+        with open(path, 'rb') as f:
+            data = f.read()
+        metrics.add_io('backups', read=len(data))
+        if path.endswith('.z'):
+            data = zlib.decompress(data)
+        return [Task.from_dict(json.loads(line)) for line in data.decode('utf-8').splitlines()]
+
+    # 📜 Generations
+    def generations(self):
+        # Oldest first.
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.manifests_dir)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.manifests_dir, name)) as f:
+                    manifest = json.load(f)
+                manifest['name'] = name
+                manifests.append(manifest)
+        return manifests
+
+    def at(self, when):
+        # Latest generation taken at or before `when`.
+        found = None
+        for manifest in self.generations():
+            if datetime.fromisoformat(manifest['created']) <= when:
+                found = manifest
+        return found
+
+    # 💾 Backup
+    def backup(self, tasks, created=None):
+        created = created or datetime.now()
+        chunks = []
+        known = {}
+        count = written = 0
+        for chunk in _chunks(tasks):
+            ids = tuple(t.id for t in chunk)
+            digest = self._known.get(ids)
+            if digest is None or not self._dirty.isdisjoint(ids) or self._object_path(digest) is None:
+                data = '\n'.join(json.dumps(t.to_dict(), sort_keys=True) for t in chunk).encode('utf-8')
+                digest, new = self._write_object(data)
+                written += new
+            known[ids] = digest
+            chunks.append(digest)
+            count += len(ids)
+        manifest = {
+            'created': created.isoformat(),
+            'count': count,
+            'chunks': chunks,
+        }
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        name = created.strftime('%Y%m%dT%H%M%S%f') + '.json'
+        _atomic_write(os.path.join(self.manifests_dir, name), json.dumps(manifest).encode('utf-8'))
+        manifest['name'] = name
+        manifest['written'] = written
+        self._known = known
+        self._dirty = set()
+        self.prune()
+        return manifest
+
+    def import_legacy(self, path):
+        # An old single-file tasks_backup.json becomes the first generation.
+        with open(path) as f:
+            tasks = [Task.from_dict(t) for t in json.load(f)]
+        for n, task in enumerate(tasks, 1):
+            if not isinstance(task.id, int):
+                task.id = n
+        return self.backup(tasks, datetime.fromtimestamp(os.path.getmtime(path)))
+
+    def prune(self):
+        manifests = self.generations()
+        expired = manifests[:max(len(manifests) - self.generations_kept, 0)]
+        if not expired:
+            return
+        for manifest in expired:
+            os.remove(os.path.join(self.manifests_dir, manifest['name']))
+        live = {digest for manifest in manifests[len(expired):] for digest in manifest['chunks']}
+        for folder in os.listdir(self.objects_dir):
+            folder = os.path.join(self.objects_dir, folder)
+            for name in os.listdir(folder):
+                if name.split('.')[0] not in live:
+                    os.remove(os.path.join(folder, name))
+
+    # ♻️ Restore
+    def load(self, manifest):
+        tasks = []
+        for digest in manifest['chunks']:
+            tasks.extend(self._read_object(digest))
+        return tasks
+
+    def restore(self, store, manifest):
+        # Only tasks that differ from the backup are written, each as its own
+        # add/update/delete. Re-added tasks go straight to their place in the
+        # backup, so the whole list is only rewritten (reorder) if the tasks
+        # that were kept have been sorted since.
+        tasks = self.load(manifest)
+        wanted = {t.id: t for t in tasks}
+        report = {'added': 0, 'updated': 0, 'deleted': 0, 'reordered': False}
+        with store.batch():
+            for index in range(len(store.tasks) - 1, -1, -1):
+                if store.tasks[index].id not in wanted:
+                    store.delete(index)
+                    report['deleted'] += 1
+            for index, current in enumerate(store.tasks):
+                changed = self._changed_fields(current, wanted[current.id])
+                if changed:
+                    store.update(index, changed)
+                    report['updated'] += 1
+            for position, task in enumerate(tasks):
+                try:
+                    store.get(task.id)
+                except KeyError:
+                    store.add(task, position)
+                    report['added'] += 1
+            order = [t.id for t in tasks]
+            if [t.id for t in store.tasks] != order:
+                store.reorder(order)
+                report['reordered'] = True
+        return report
+
+    def restore_task(self, store, task):
+        # Returns True if the task had to be re-added, False if it was updated.
+        try:
+            current = store.get(task.id)
+        except KeyError:
+            store.add(task)
+            return True
+        changed = self._changed_fields(current, task)
+        if changed:
+            store.update(store.index_of(task.id), changed)
+        return False
+
+    @staticmethod
+    def _changed_fields(current, task):
+        return {name: value for name, value in task.fields(Task.FIELDS).items()
+                if getattr(current, name) != value}
+
+    # 👂 Store events
+    def on_update(self, task, old):
+        self._dirty.add(task.id)
+
+    def on_add(self, task):
+        self._dirty.add(task.id)
+
+    def on_delete(self, task, index):
+        self._dirty.add(task.id)
+
+    def on_reset(self, tasks, old_tasks):
+        self._known = {}
+        self._dirty = set()
+
+
+def open_backups(root, store, generations=BACKUP_GENERATIONS, compress=True):
+    backups = BackupStore(root, generations, compress)
+    store.subscribe(backups)
+    return backups
@@ -0,0 +1,148 @@
+import json
+import select
+import socket
+import threading
+import http.client
+from urllib.parse import urlsplit, quote
+
+from task_model import Task
+
+# 🔌 Client for the local task service (task_server.py)
+#
+#   with TaskClient("http://127.0.0.1:8765") as todo:     # or TaskClient("unix:todo.sock")
+#       task = todo.add("Write report", category="Work", due="2025-08-01")
+#       todo.complete(task.id)
+#       for t in todo.search("report"):
+#           print(t.task)
+#
+# Each thread using a client gets its own keep-alive connection, opened on
+# first use and reused for every later request, so one client can be shared
+# by a pool of worker threads. A connection the server closed while it sat
+# idle is reopened before use. If a connection breaks after a request was
+# sent, only reads are retried: a write may have been applied already, and
+# sending it again could add a task twice.
+
+RETRY_METHODS = ('GET',)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _dropped(conn):
+    # The server closed this idle connection: its socket reads as
+    # end-of-file before anything was sent.
+    if conn.sock is None:
+        return False
+    if not select.select([conn.sock], [], [], 0)[0]:
+        return False
+    try:
+        return conn.sock.recv(1, socket.MSG_PEEK) == b''
+    except OSError:
+        return True
+
+
+class TaskClient:
+    def __init__(self, address="http://127.0.0.1:8765", timeout=30):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    # 🔗 Connections
+    def _connect(self):
+        if self.address.startswith("unix:"):
+            conn = UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        else:
+            url = urlsplit(self.address)
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        for attempt in (1, 2):
+            conn = self._connection()
+            if _dropped(conn):
+                conn.close()  # reconnects on the request below
+            sent = False
+            try:
+                conn.request(method, path, data, headers)
+                sent = True
+                response = conn.getresponse()
+                payload = json.loads(response.read() or b'null')
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt == 2 or (sent and method not in RETRY_METHODS):
+                    raise
+        if response.status == 404:
+            raise KeyError(payload['error'])
+        if response.status != 200:
+            raise ValueError(payload['error'])
+        return payload
+
+    # 🔎 Reads
+    def list(self, category=None, sort=None):
+        query = "&".join(f"{name}={quote(value)}" for name, value in (('category', category), ('sort', sort))
+                         if value)
+        return [Task.from_dict(t) for t in self._request("GET", "/tasks" + ("?" + query if query else ""))]
+
+    def get(self, task_id):
+        return Task.from_dict(self._request("GET", f"/tasks/{task_id}"))
+
+    def search(self, query):
+        return [Task.from_dict(t) for t in self._request("GET", f"/search?q={quote(query)}")]
+
+    def stats(self):
+        return self._request("GET", "/stats")
+
+    # ✍️ Writes
+    def add(self, task, category="Other", due="", priority="Medium", repeat=""):
+        body = {'task': task, 'category': category, 'due': due, 'priority': priority, 'repeat': repeat}
+        return Task.from_dict(self._request("POST", "/tasks", body))
+
+    def complete(self, task_id):
+        return Task.from_dict(self._request("POST", f"/tasks/{task_id}/complete"))
+
+    def edit(self, task_id, **fields):
+        return Task.from_dict(self._request("PATCH", f"/tasks/{task_id}", fields))
+
+    def delete(self, task_id):
+        return Task.from_dict(self._request("DELETE", f"/tasks/{task_id}"))
+
+    def undo(self):
+        return self._request("POST", "/undo")['undo']
+
+    def redo(self):
+        return self._request("POST", "/redo")['redo']
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
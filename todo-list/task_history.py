@@ -0,0 +1,244 @@
+import os
+import re
+import gzip
+import json
+import shutil
+from contextlib import nullcontext
+from datetime import datetime
+
+from file_lock import FileLock
+from task_metrics import metrics
+
+# 📜 Structured, rotating task history
+#
+#   history/current.jsonl              entries being written, one JSON object per line
+#   history/00001-20250801T0930.jsonl.gz   sealed, compressed segments
+#   history/index.json                 per-segment time range, action counts and task ids
+#
+# Each entry is {"t": time, "action": ..., "id": task id, "task": task name}.
+# Once current.jsonl grows past HISTORY_SEGMENT_BYTES it is compressed into a
+# sealed segment and its summary added to the index; only the newest
+# HISTORY_SEGMENTS segments are kept. Queries walk the segments newest first
+# and use the index to skip every segment that cannot match (wrong action,
+# task or time range), so tailing or filtering never reads the whole history.
+# Sessions sharing the folder write and rotate under history/history.lock.
+# Read-only mode opens the history with writable=False: nothing is created,
+# migrated or locked, and queries cope with files rotated away meanwhile.
+
+HISTORY_SEGMENT_BYTES = 256 * 1024
+HISTORY_SEGMENTS = 50
+
+LEGACY_LINE = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\S* - (\w+): (.*)$')
+
+
+def _new_summary():
+    return {'first': None, 'last': None, 'count': 0, 'actions': {}, 'ids': set()}
+
+
+def _summarize(summary, record):
+    if summary['first'] is None:
+        summary['first'] = record['t']
+    summary['last'] = record['t']
+    summary['count'] += 1
+    summary['actions'][record['action']] = summary['actions'].get(record['action'], 0) + 1
+    if record.get('id') is not None:
+        summary['ids'].add(record['id'])
+
+
+class HistoryLog:
+    def __init__(self, root, segment_bytes=HISTORY_SEGMENT_BYTES, keep=HISTORY_SEGMENTS, writable=True):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.keep = keep
+        self.writable = writable
+        self.current_path = os.path.join(root, 'current.jsonl')
+        self.index_path = os.path.join(root, 'index.json')
+        if writable:
+            os.makedirs(root, exist_ok=True)
+            self._lock = FileLock(os.path.join(root, 'history.lock'))
+        else:
+            self._lock = nullcontext()
+        self.segments = []
+        self._index_stamp = None
+        # Summary of current.jsonl up to byte _size, and which file that was.
+        self.current = _new_summary()
+        self._current_id = None
+        self._size = 0
+        with self._lock:
+            self._sync()
+
+    # 🔒 Other sessions append and rotate too. Everything that writes runs
+    # under history.lock and first catches up: index.json is reloaded if it
+    # changed, and current.jsonl is summarized from where this session
+    # stopped, or from the start if it is no longer the same file.
+    def _sync(self):
+        try:
+            st = os.stat(self.index_path)
+            stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            stamp = None
+        rotated = stamp != self._index_stamp
+        if rotated:
+            # Only rotate() writes the index, so current.jsonl is a new file
+            # (possibly with the old one's inode number).
+            self.segments = []
+            if stamp is not None:
+                with open(self.index_path) as f:
+                    self.segments = json.load(f)
+                for segment in self.segments:
+                    segment['ids'] = set(segment['ids'])
+            self._index_stamp = stamp
+        try:
+            st = os.stat(self.current_path)
+        except FileNotFoundError:
+            st = None
+        current_id = (st.st_dev, st.st_ino) if st is not None else None
+        if rotated or current_id != self._current_id:
+            self.current = _new_summary()
+            self._current_id = current_id
+            self._size = 0
+        if st is not None and st.st_size > self._size:
+            with open(self.current_path, 'rb') as f:
+                f.seek(self._size)
+                data = f.read()
+            metrics.add_io('history', read=len(data))
+            # A torn final line (crash mid-append) is left unread.
+            data = data[:data.rfind(b'\n') + 1]
+            for line in data.splitlines():
+                try:
+                    _summarize(self.current, json.loads(line))
+                except ValueError:
+                    continue
+            self._size += len(data)
+
+    # ✍️ Writing
+    def log(self, action, task, when=None):
+        self._append(action, task.id, task.task, when)
+
+    def _append(self, action, task_id, name, when=None):
+        record = {
+            't': (when or datetime.now()).isoformat(timespec='seconds'),
+            'action': action,
+            'id': task_id,
+            'task': name,
+        }
+        if not self.writable:
+            raise ValueError("the history is open read-only")
+        data = (json.dumps(record) + '\n').encode('utf-8')
+        with self._lock:
+            self._sync()
+            # Opened per entry: a file kept open would go on writing to
+            # current.jsonl after another session rotated it away.
+            with open(self.current_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                st = os.fstat(f.fileno())
+            metrics.add_io('history', written=len(data))
+            _summarize(self.current, record)
+            self._current_id = (st.st_dev, st.st_ino)
+            self._size = st.st_size
+            if self._size >= self.segment_bytes:
+                self.rotate()
+
+    def rotate(self):
+        with self._lock:
+            self._sync()
+            if not self.current['count']:
+                return
+            number = self.segments[-1]['number'] + 1 if self.segments else 1
+            started = self.current['first'].replace('-', '').replace(':', '')[:13]
+            name = f"{number:05d}-{started}.jsonl.gz"
+            tmp_path = os.path.join(self.root, name + '.tmp')
+            with open(self.current_path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, os.path.join(self.root, name))
+            self.segments.append(dict(self.current, file=name, number=number))
+            while len(self.segments) > self.keep:
+                os.remove(os.path.join(self.root, self.segments.pop(0)['file']))
+            self._write_index()
+            os.remove(self.current_path)
+            self.current = _new_summary()
+            self._current_id = None
+            self._size = 0
+
+    def _write_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump([dict(s, ids=sorted(s['ids'])) for s in self.segments], f)
+        os.replace(tmp_path, self.index_path)
+        st = os.stat(self.index_path)
+        self._index_stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def import_legacy(self, path):
+        # Free-text lines of the old history.log: "<time> - <Action>: <task>".
+        with self._lock:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = LEGACY_LINE.match(line.rstrip('\n'))
+                    if match:
+                        when = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+                        self._append(match.group(2), None, match.group(3), when)
+            os.replace(path, path + '.migrated')
+
+    def close(self):
+        if self.writable:
+            self._lock.close()
+
+    # 🔎 Queries
+    def _read(self, name):
+        # Entries of one segment (None = current.jsonl), oldest first.
+        try:
+            if name is None:
+                f = open(self.current_path, encoding='utf-8')
+            else:
+                f = gzip.open(os.path.join(self.root, name), 'rt', encoding='utf-8')
+        except FileNotFoundError:
+            # Rotated, or pruned by another session since the index was read.
+            return []
+        records = []
+        with f:
+            for line in f:
+                metrics.add_io('history', read=len(line))
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Torn final line from a crash mid-append.
+                    break
+        return records
+
+    def query(self, action=None, task_id=None, text=None, since=None):
+        # Matching entries, newest first. `since` is an ISO date/time string.
+        action = action.lower() if action else None
+        text = text.lower() if text else None
+        with self._lock:
+            self._sync()
+            current = self._read(None)
+            summaries = [(None, self.current)] + [(s['file'], s) for s in reversed(self.segments)]
+        for name, summary in summaries:
+            if not summary['count']:
+                continue
+            if since and summary['last'] < since:
+                return
+            if action and not any(a.lower() == action for a in summary['actions']):
+                continue
+            if task_id is not None and task_id not in summary['ids']:
+                continue
+            records = current if name is None else self._read(name)
+            for record in reversed(records):
+                if since and record['t'] < since:
+                    return
+                if action and record['action'].lower() != action:
+                    continue
+                if task_id is not None and record.get('id') != task_id:
+                    continue
+                if text and text not in record['task'].lower():
+                    continue
+                yield record
+
+
+def open_history(root, legacy_path=None, segment_bytes=HISTORY_SEGMENT_BYTES, keep=HISTORY_SEGMENTS,
+                 writable=True):
+    history = HistoryLog(root, segment_bytes, keep, writable)
+    if writable and legacy_path and os.path.exists(legacy_path):
+        history.import_legacy(legacy_path)
+    return history
@@ -0,0 +1,146 @@
+import os
+import csv
+import gzip
+import json
+import time
+
+from task_model import Task, parse_due, PRIORITY_BY_NAME, STATUS_BY_NAME
+from task_metrics import metrics
+from task_reminders import parse_repeat
+
+# 📦 Streaming CSV export and bulk CSV/JSONL import
+#
+# Export walks the tasks once and writes rows in chunks. Import reads the
+# file row by row, validates each one and hands valid tasks to the store in
+# batches (store.add_many), so only one batch is in memory at a time and the
+# journal is written once per batch. A path ending in ".gz" is read or
+# written through gzip.
+
+EXPORT_HEADER = ['Task', 'Category', 'Due Date', 'Priority', 'Status', 'Repeat']
+CHUNK_SIZE = 1000
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 10
+
+# Column names accepted on import: our CSV export header and tasks.json keys.
+IMPORT_COLUMNS = {
+    'task': 'task', 'category': 'category', 'due': 'due', 'due date': 'due',
+    'priority': 'priority', 'status': 'status', 'repeat': 'repeat',
+}
+
+
+def open_text(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', newline='', encoding='utf-8')
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+# 📤 Export
+def export_csv(tasks, path, chunk_size=CHUNK_SIZE):
+    started = time.perf_counter()
+    count = 0
+    with open_text(path, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADER)
+        chunk = []
+        for task in tasks:
+            chunk.append((task.task, task.category, task.due, task.priority.label, task.status.label,
+                          task.repeat))
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                count += len(chunk)
+                chunk = []
+        writer.writerows(chunk)
+        count += len(chunk)
+    metrics.add_io('export', written=os.path.getsize(path))
+    return count, time.perf_counter() - started
+
+
+# 📥 Import
+def iter_rows(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    with open_text(path, 'r') as f:
+        if name.endswith(('.jsonl', '.ndjson')):
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield ValueError(f"invalid JSON: {e}")
+        else:
+            yield from csv.DictReader(f)
+
+
+def validate_row(row):
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    fields = {}
+    for key, value in row.items():
+        column = IMPORT_COLUMNS.get(str(key).strip().lower())
+        if column is not None:
+            fields[column] = '' if value is None else str(value).strip()
+    if not fields.get('task'):
+        raise ValueError("missing task name")
+    due = fields.get('due', '')
+    if due and parse_due(due) is None:
+        raise ValueError(f"bad due date {due!r} (expected YYYY-MM-DD)")
+    priority = fields.get('priority') or 'medium'
+    if priority.lower() not in PRIORITY_BY_NAME:
+        raise ValueError(f"unknown priority {priority!r}")
+    status = fields.get('status') or 'pending'
+    if status.lower() not in STATUS_BY_NAME:
+        raise ValueError(f"unknown status {status!r}")
+    repeat = parse_repeat(fields.get('repeat'))
+    return Task(
+        fields['task'],
+        fields.get('category', ''),
+        due,
+        PRIORITY_BY_NAME[priority.lower()],
+        STATUS_BY_NAME[status.lower()],
+        repeat=repeat,
+    )
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        rows = self.imported + self.rejected
+        return rows / self.seconds if self.seconds else float(rows)
+
+
+def import_tasks(store, path, batch_size=BATCH_SIZE, on_batch=None):
+    report = ImportReport()
+    started = time.perf_counter()
+    batch = []
+    for line_no, row in enumerate(iter_rows(path), 1):
+        try:
+            batch.append(validate_row(row))
+        except ValueError as e:
+            report.rejected += 1
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append(f"row {line_no}: {e}")
+            continue
+        if len(batch) >= batch_size:
+            store.add_many(batch)
+            report.imported += len(batch)
+            batch = []
+            if on_batch:
+                on_batch(report, time.perf_counter() - started)
+    if batch:
+        store.add_many(batch)
+        report.imported += len(batch)
+    report.seconds = time.perf_counter() - started
+    metrics.add_io('import', read=os.path.getsize(path))
+    return report
+
+
+def import_format_supported(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return os.path.splitext(name)[1].lower() in ('.csv', '.jsonl', '.ndjson')
@@ -0,0 +1,190 @@
+import sys
+import json
+import time
+import functools
+from collections import Counter
+from contextlib import contextmanager
+
+from task_model import parse_due
+
+# 📈 Opt-in instrumentation
+#
+#   python todo_list.py --metrics              (or "metrics": true in settings.json)
+#   python todo_list.py --profile out.prof list --sort due
+#
+# When enabled, the menu actions, the store operations and the other
+# components' main entry points are wrapped with timers (instrument()), each
+# feeding a latency histogram with power-of-two microsecond buckets. Code
+# that reads or writes files reports the bytes through add_io(), and store
+# events are counted. The report is shown by the "Performance Metrics" menu
+# entry and printed to stderr at exit, and also written as JSON to
+# settings["metrics_file"] if that is set.
+#
+# When disabled nothing is wrapped, so the only cost left is the enabled
+# check in add_io() and timer().
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        # bucket i counts samples below 2**i microseconds
+        self.buckets = Counter()
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[int(seconds * 1e6).bit_length()] += 1
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of samples.
+        wanted = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= wanted:
+                return min(2 ** bucket / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'min_s': self.min,
+            'max_s': self.max,
+            'p50_s': self.percentile(0.5),
+            'p95_s': self.percentile(0.95),
+            'buckets_us': {str(2 ** b): n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.io = {}
+        self.events = Counter()
+        self.store = None
+
+    # ⏱️ Timing
+    def record(self, name, seconds):
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = Histogram()
+        histogram.add(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - started)
+        return timed
+
+    def instrument(self, owner, names, prefix=''):
+        # Replace owner.<name> (module function or bound method) with a timed
+        # version. Does nothing while disabled.
+        if not self.enabled or owner is None:
+            return
+        for name in names:
+            fn = getattr(owner, name, None)
+            if fn is not None and not hasattr(fn, '__wrapped__'):
+                setattr(owner, name, self.wrap(prefix + name, fn))
+
+    # 💽 Bytes
+    def add_io(self, name, read=0, written=0):
+        if self.enabled:
+            totals = self.io.setdefault(name, [0, 0])
+            totals[0] += read
+            totals[1] += written
+
+    # 👂 Store events (a store listener; task_store itself reports bytes here,
+    # so this module cannot import it)
+    def watch(self, store):
+        self.store = store
+        if self.enabled:
+            store.subscribe(self)
+
+    def on_add(self, task):
+        self.events['add'] += 1
+
+    def on_update(self, task, old):
+        self.events['update'] += 1
+
+    def on_delete(self, task, index):
+        self.events['delete'] += 1
+
+    def on_reorder(self, tasks, old_order):
+        self.events['reorder'] += 1
+
+    def on_reset(self, tasks, old_tasks):
+        self.events['reset'] += 1
+
+    # 📋 Reports
+    def to_dict(self):
+        cache = parse_due.cache_info()
+        return {
+            'session_s': time.perf_counter() - self.started,
+            'tasks': len(self.store.tasks) if self.store is not None else None,
+            'timings': {name: h.to_dict() for name, h in sorted(self.timings.items())},
+            'io': {name: {'read': r, 'written': w} for name, (r, w) in sorted(self.io.items())},
+            'events': dict(self.events),
+            'parse_due_cache': {'hits': cache.hits, 'misses': cache.misses},
+        }
+
+    def report(self):
+        data = self.to_dict()
+        lines = [f"Session {data['session_s']:.1f}s, {data['tasks']} tasks"]
+        if data['timings']:
+            lines.append(f"{'operation':32} {'calls':>7} {'total':>10} {'p50':>10} {'p95':>10} {'max':>10}")
+            for name, h in sorted(data['timings'].items(), key=lambda item: -item[1]['total_s']):
+                lines.append(f"{name:32} {h['count']:>7} {_ms(h['total_s'])} {_ms(h['p50_s'])} "
+                             f"{_ms(h['p95_s'])} {_ms(h['max_s'])}")
+        for name, io in data['io'].items():
+            lines.append(f"{name:32} read {_size(io['read']):>10}   written {_size(io['written']):>10}")
+        if data['events']:
+            lines.append("store events: " + ", ".join(f"{k} {n}" for k, n in sorted(data['events'].items())))
+        cache = data['parse_due_cache']
+        lines.append(f"due date parsing: {cache['misses']} parsed, {cache['hits']} cached")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        print(self.report(), file=sys.stderr)
+        if path:
+            with open(path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:>8.2f}ms"
+
+
+def _size(count):
+    if count < 1024:
+        return f"{count}B"
+    if count < 1024 * 1024:
+        return f"{count / 1024:.1f}KiB"
+    return f"{count / (1024 * 1024):.1f}MiB"
+
+
+metrics = Metrics()
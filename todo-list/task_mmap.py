@@ -0,0 +1,240 @@
+import os
+import json
+import mmap
+import struct
+from collections import Counter
+from contextlib import contextmanager
+
+from task_model import Task, Priority, Status, parse_due
+from task_store import read_tasks, store_files, file_fingerprint, count_tasks
+from task_view import LazyView
+from search_index import parse_query, matches
+
+# 🗺️ Memory-mapped, read-only task view
+#
+# tasks.bin is a compact copy of the task list made for viewing:
+#
+#   header    magic, row count, section offsets, length of the meta block
+#   rows      per task: id, priority, status, category number, then the
+#             UTF-8 title, due date and repeat
+#   offsets   one u64 per row, where the row starts
+#   ids       (id, row) pairs sorted by id, for lookups by id
+#   category  row numbers grouped by category (u32)
+#   meta      JSON: store fingerprint, category names, statistics counts,
+#             and per category the slice of the category index it owns
+#
+# The file is memory-mapped and rows are decoded only when a page, a filter
+# or a search touches them, so opening it costs the same for 1k or 1M tasks
+# and nothing but the rows on screen ends up as Python objects. It is rebuilt
+# from the store's files whenever they have changed since; they are only
+# read for that (no lock, journal, cache or database is created), so
+# tasks.bin is the only file read-only mode writes.
+
+MAGIC = b'TASKBIN2'  # files of an older layout are rebuilt
+HEADER = struct.Struct('<8sQQQQQI')  # magic, count, rows, offsets, ids, categories, meta length
+ROW = struct.Struct('<qBBHHIB')  # id, priority, status, category, due, title and repeat lengths
+OFFSET = struct.Struct('<Q')
+ID_ENTRY = struct.Struct('<qI')
+ROW_NUMBER = struct.Struct('<I')
+
+
+def write_task_file(path, tasks, fingerprint):
+    categories = {}
+    by_category = {}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        rows_start = f.tell()
+        offsets = []
+        for row, task in enumerate(tasks):
+            offsets.append(f.tell() - rows_start)
+            number = categories.setdefault(task.category, len(categories))
+            by_category.setdefault(task.category.capitalize(), []).append(row)
+            title = task.task.encode('utf-8')
+            due = task.due.encode('utf-8')
+            repeat = task.repeat.encode('utf-8')
+            f.write(ROW.pack(task.id, task.priority, task.status, number, len(due), len(title), len(repeat)))
+            f.write(title)
+            f.write(due)
+            f.write(repeat)
+        offsets_start = f.tell()
+        f.write(b''.join(OFFSET.pack(rows_start + offset) for offset in offsets))
+        ids_start = f.tell()
+        ids = sorted((task.id, row) for row, task in enumerate(tasks))
+        f.write(b''.join(ID_ENTRY.pack(task_id, row) for task_id, row in ids))
+        categories_start = f.tell()
+        category_slices = {}
+        position = 0
+        for name, rows in by_category.items():
+            category_slices[name] = [position, len(rows)]
+            position += len(rows)
+            f.write(b''.join(ROW_NUMBER.pack(row) for row in rows))
+        counts = count_tasks(tasks)
+        meta = json.dumps({
+            'fingerprint': fingerprint,
+            'categories': list(categories),
+            'category_rows': category_slices,
+            'counts': {
+                'status': {int(k): n for k, n in counts['status'].items()},
+                'category': dict(counts['category']),
+                'priority': {int(k): n for k, n in counts['priority'].items()},
+                'open_due': {k.isoformat(): n for k, n in counts['open_due'].items()},
+            },
+        }).encode('utf-8')
+        f.write(meta)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(offsets), rows_start, offsets_start, ids_start,
+                            categories_start, len(meta)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class MappedTasks:
+    # Sequence of Task records decoded from the map on access.
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return self._store.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._store.row(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._store.row(i)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class MappedStore:
+    read_only = True
+    syncing = False
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count, self._rows, self._offsets, self._ids, self._categories, meta_length = \
+                HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a task file")
+            # The meta block is the last `meta_length` bytes of the file.
+            self.meta = json.loads(self._map[len(self._map) - meta_length:])
+        except (ValueError, struct.error):
+            self._file.close()
+            raise
+        self.category_names = self.meta['categories']
+        self.tasks = MappedTasks(self)
+        self.listeners = []
+
+    # 🔎 Rows
+    def row(self, index):
+        offset = OFFSET.unpack_from(self._map, self._offsets + index * OFFSET.size)[0]
+        task_id, priority, status, category, due_length, title_length, repeat_length = \
+            ROW.unpack_from(self._map, offset)
+        start = offset + ROW.size
+        title = self._map[start:start + title_length].decode('utf-8')
+        start += title_length
+        due = self._map[start:start + due_length].decode('utf-8')
+        start += due_length
+        repeat = self._map[start:start + repeat_length].decode('utf-8')
+        return Task(title, self.category_names[category], due, Priority(priority), Status(status), task_id,
+                    repeat)
+
+    def title(self, index):
+        offset = OFFSET.unpack_from(self._map, self._offsets + index * OFFSET.size)[0]
+        title_length = ROW.unpack_from(self._map, offset)[5]
+        start = offset + ROW.size
+        return self._map[start:start + title_length].decode('utf-8')
+
+    def _row_of(self, task_id):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_id, row = ID_ENTRY.unpack_from(self._map, self._ids + mid * ID_ENTRY.size)
+            if mid_id < task_id:
+                lo = mid + 1
+            elif mid_id > task_id:
+                hi = mid
+            else:
+                return row
+        raise KeyError(task_id)
+
+    def get(self, task_id):
+        return self.row(self._row_of(task_id))
+
+    def index_of(self, task_id):
+        return self._row_of(task_id)
+
+    # 🔎 Queries
+    def filter_by_category(self, category):
+        start, length = self.meta['category_rows'].get(category.capitalize(), (0, 0))
+        base = self._categories + start * ROW_NUMBER.size
+        rows = (ROW_NUMBER.unpack_from(self._map, base + n * ROW_NUMBER.size)[0] for n in range(length))
+        return LazyView((self.row(row) for row in rows), length)
+
+    def search(self, query):
+        # No index in memory: titles are matched as the pages are filled.
+        groups = parse_query(query)
+        return LazyView(self.row(i) for i in range(self.count) if matches(groups, self.title(i)))
+
+    def counts(self):
+        counts = self.meta['counts']
+        return {
+            'status': Counter({Status(int(k)): n for k, n in counts['status'].items()}),
+            'category': Counter(counts['category']),
+            'priority': Counter({Priority(int(k)): n for k, n in counts['priority'].items()}),
+            'open_due': Counter({parse_due(k): n for k, n in counts['open_due'].items()}),
+        }
+
+    # 🔌 Store interface used by the read-only menu
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+    def refresh(self):
+        # A snapshot: changes made meanwhile show up on the next start.
+        pass
+
+    def fingerprint(self):
+        return self.meta['fingerprint']
+
+    def files(self):
+        return [self.path]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def open_mapped(path, backend="journal"):
+    # Map <tasks>.bin, rebuilding it first if the store changed since.
+    bin_path = os.path.splitext(path)[0] + '.bin'
+    fingerprint = file_fingerprint(store_files(path, backend))
+    if os.path.exists(bin_path):
+        try:
+            mapped = MappedStore(bin_path)
+        except (ValueError, KeyError, struct.error):
+            mapped = None
+        if mapped is not None:
+            if mapped.fingerprint() == fingerprint:
+                return mapped
+            mapped.close()
+    # Read without the store's write-side setup: tasks.bin is the only
+    # file read-only mode writes.
+    tasks, fingerprint = read_tasks(path, backend)
+    write_task_file(bin_path, tasks, fingerprint)
+    return MappedStore(bin_path)
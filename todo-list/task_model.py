@@ -0,0 +1,151 @@
+import sys
+from enum import IntEnum
+from datetime import datetime
+from functools import lru_cache
+
+# 🧩 Task records
+#
+# Tasks are held as compact __slots__ objects instead of dicts. Priority and
+# status are small int enums (their value is also their sort rank), the due
+# string is parsed once into `due_date`, and category strings are interned so
+# thousands of tasks share one copy. tasks.json, the journal and CSV files
+# keep the same plain-dict layout as before; to_dict()/from_dict() convert.
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+
+    @property
+    def label(self):
+        return PRIORITY_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        return _PRIORITY_BY_LABEL.get(label, cls.MEDIUM)
+
+
+class Status(IntEnum):
+    PENDING = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+
+    @property
+    def label(self):
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        return _STATUS_BY_LABEL.get(label, cls.PENDING)
+
+
+PRIORITY_LABELS = {Priority.HIGH: "High", Priority.MEDIUM: "Medium", Priority.LOW: "Low"}
+STATUS_LABELS = {Status.PENDING: "Pending", Status.IN_PROGRESS: "In-Progress", Status.COMPLETED: "Completed"}
+_PRIORITY_BY_LABEL = {label: p for p, label in PRIORITY_LABELS.items()}
+_STATUS_BY_LABEL = {label: s for s, label in STATUS_LABELS.items()}
+# Labels as typed by users: any case.
+PRIORITY_BY_NAME = {label.lower(): p for p, label in PRIORITY_LABELS.items()}
+STATUS_BY_NAME = {label.lower(): s for s, label in STATUS_LABELS.items()}
+
+
+def parse_priority(text):
+    # A priority label in any case; ValueError for anything else (unlike
+    # Priority.from_label, which falls back to Medium).
+    try:
+        return PRIORITY_BY_NAME[text.strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown priority {text!r}, use {', '.join(PRIORITY_LABELS.values())}") from None
+
+
+def parse_status(text):
+    # A status label in any case; ValueError for anything else.
+    try:
+        return STATUS_BY_NAME[text.strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown status {text!r}, use {', '.join(STATUS_LABELS.values())}") from None
+
+
+@lru_cache(maxsize=4096)
+def parse_due(due):
+    try:
+        return datetime.strptime(due, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class Task:
+    __slots__ = ('id', 'task', 'category', '_due', 'due_date', 'priority', 'status', 'repeat')
+
+    FIELDS = ('task', 'category', 'due', 'priority', 'status', 'repeat')
+
+    def __init__(self, task, category, due, priority=Priority.MEDIUM, status=Status.PENDING, id=None,
+                 repeat=''):
+        self.id = id
+        self.task = task
+        self.category = sys.intern(category)
+        self.due = due
+        self.priority = priority
+        self.status = status
+        # '', or how often the task recurs (see task_reminders.py)
+        self.repeat = repeat
+
+    @property
+    def due(self):
+        return self._due
+
+    @due.setter
+    def due(self, value):
+        self._due = value
+        self.due_date = parse_due(value)
+
+    def update(self, fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def fields(self, names):
+        return {name: getattr(self, name) for name in names}
+
+    def copy(self):
+        return Task(self.task, self.category, self.due, self.priority, self.status, self.id, self.repeat)
+
+    # 🔁 Plain-dict conversion (tasks.json, journal, backups)
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'task': self.task,
+            'category': self.category,
+            'due': self.due,
+            'priority': self.priority.label,
+            'status': self.status.label,
+        }
+        if self.repeat:
+            # Only recurring tasks carry the key, so other records stay as they were.
+            data['repeat'] = self.repeat
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get('task', ''),
+            data.get('category', ''),
+            data.get('due', ''),
+            Priority.from_label(data.get('priority')),
+            Status.from_label(data.get('status')),
+            data.get('id'),
+            data.get('repeat', ''),
+        )
+
+
+def fields_to_dict(fields):
+    return {name: value.label if isinstance(value, (Priority, Status)) else value
+            for name, value in fields.items()}
+
+
+def fields_from_dict(data):
+    fields = dict(data)
+    if 'priority' in fields:
+        fields['priority'] = Priority.from_label(fields['priority'])
+    if 'status' in fields:
+        fields['status'] = Status.from_label(fields['status'])
+    return fields
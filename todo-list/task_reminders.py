@@ -0,0 +1,156 @@
+import heapq
+import calendar
+from datetime import datetime, date, timedelta
+
+from task_model import Task, Status
+from task_store import StoreListener
+
+# ⏰ Reminders and recurring tasks
+#
+# Every open task with a due date has two moments: its due day ("due") and
+# the day after ("overdue"). They sit in a min-heap ordered by day number,
+# so poll() only looks at the top of the heap: it pops the
+# moments that have passed and returns them as reminders, O(log n) each,
+# without walking the task list. Store events push the moments of added or
+# edited tasks; entries of tasks edited, completed or deleted since are left
+# in the heap and skipped when they come up (each entry carries the task's
+# version at the time it was pushed). The heap is built by the first poll(),
+# so sessions that never ask for reminders do not walk the tasks for it.
+#
+# A task with `repeat` set (daily, weekly, monthly, yearly) recurs: when it
+# is completed, its next occurrence is added as a new pending task and the
+# rule moves over to it. Only the next occurrence ever exists; if the task
+# was completed late, occurrences already in the past are skipped.
+
+REPEATS = ('daily', 'weekly', 'monthly', 'yearly')
+KINDS = ('due', 'overdue')
+
+
+def parse_repeat(text):
+    # '' (no repeat) or one of REPEATS; ValueError for anything else.
+    text = (text or '').strip().lower()
+    if text in ('', 'none', 'no'):
+        return ''
+    if text not in REPEATS:
+        raise ValueError(f"unknown repeat {text!r}, use {', '.join(REPEATS)} or none")
+    return text
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    # 31 Jan + 1 month is the last day of February.
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def advance(day, repeat, times=1):
+    # `times` steps at once, so months are always counted from the original
+    # day (31 Jan -> 28 Feb -> 31 Mar, not 28 Mar).
+    if repeat == 'daily':
+        return day + timedelta(days=times)
+    if repeat == 'weekly':
+        return day + timedelta(weeks=times)
+    if repeat == 'monthly':
+        return _add_months(day, times)
+    return _add_months(day, 12 * times)
+
+
+def next_due(day, repeat, today):
+    # The first occurrence after `day` that is not in the past.
+    day = day or today
+    times = 1
+    while advance(day, repeat, times) < today:
+        times += 1
+    return advance(day, repeat, times)
+
+
+class ReminderEngine(StoreListener):
+    def __init__(self, store, undo_log=None):
+        self.store = store
+        self.undo_log = undo_log
+        self._heap = None
+        self._versions = {}
+
+    # 🗓️ Moments: (day number, kind, task id, task version)
+    def _rebuild(self, today):
+        # Moments before today are history; a task due yesterday still gets
+        # its "overdue" reminder today, older ones do not.
+        self._start = today.toordinal()
+        self._versions = {}
+        self._heap = [entry for task in self.store.tasks for entry in self._moments(task)]
+        heapq.heapify(self._heap)
+
+    def _moments(self, task):
+        version = self._versions.get(task.id, 0) + 1
+        self._versions[task.id] = version
+        if task.status == Status.COMPLETED or task.due_date is None:
+            return ()
+        day = task.due_date.toordinal()
+        return [(day + kind, kind, task.id, version) for kind in (0, 1) if day + kind >= self._start]
+
+    def _track(self, task):
+        if self._heap is None:
+            return
+        for entry in self._moments(task):
+            heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._versions) + 64:
+            self._compact()
+
+    def _compact(self):
+        # Drop entries of tasks that changed since they were pushed.
+        self._heap = [e for e in self._heap if self._versions.get(e[2]) == e[3]]
+        heapq.heapify(self._heap)
+
+    def poll(self, today=None):
+        # Reminders whose day has come since the last poll, oldest first, as
+        # (kind, task) pairs with kind 'due' or 'overdue'.
+        today = today or datetime.now().date()
+        if self._heap is None:
+            self._rebuild(today)
+        day = today.toordinal()
+        fired = []
+        while self._heap and self._heap[0][0] <= day:
+            _, kind, task_id, version = heapq.heappop(self._heap)
+            if self._versions.get(task_id) != version:
+                continue
+            try:
+                fired.append((KINDS[kind], self.store.get(task_id)))
+            except KeyError:
+                pass
+        return fired
+
+    # 🔁 Recurrence
+    def _recur(self, task):
+        today = datetime.now().date()
+        nxt = Task(task.task, task.category, next_due(task.due_date, task.repeat, today).isoformat(),
+                   task.priority, Status.PENDING, repeat=task.repeat)
+        # The rule moves to the new occurrence, so setting this one back to
+        # pending and completing it again does not spawn a second copy.
+        self.store.update(self.store.index_of(task.id), {'repeat': ''})
+        return self.store.add(nxt)
+
+    # 👂 Store events
+    def on_add(self, task):
+        self._track(task)
+
+    def on_update(self, task, old):
+        if 'due' in old or 'status' in old:
+            self._track(task)
+        completed = old.get('status', Status.COMPLETED) != Status.COMPLETED and task.status == Status.COMPLETED
+        if completed and task.repeat and not self.store.syncing \
+                and not (self.undo_log and self.undo_log.replaying):
+            self._recur(task)
+
+    def on_delete(self, task, index):
+        self._versions.pop(task.id, None)
+
+    def on_reset(self, tasks, old_tasks):
+        if self._heap is not None:
+            self._rebuild(datetime.now().date())
+
+
+def open_reminders(store, undo_log=None):
+    reminders = ReminderEngine(store, undo_log)
+    store.subscribe(reminders)
+    return reminders
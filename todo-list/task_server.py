@@ -0,0 +1,371 @@
+import os
+import json
+import time
+import queue
+import signal
+import socket
+import threading
+import socketserver
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from task_model import Task, Priority, Status, parse_priority, parse_status
+from task_reminders import parse_repeat
+
+# 🌐 Local task service
+#
+#   python todo_list.py serve                      (http://127.0.0.1:8765)
+#   python todo_list.py serve --socket todo.sock   (Unix socket)
+#
+# One process keeps the store, search index, statistics and undo log loaded
+# and answers JSON requests, so scripts (see task_client.py) skip the start-up
+# cost of loading everything themselves:
+#
+#   GET    /tasks[?category=work][&sort=priority,due]   list tasks
+#   GET    /tasks/<id>                 one task
+#   POST   /tasks                      add: {"task", "category", "due", "priority", "repeat"}
+#   POST   /tasks/<id>/complete        mark completed
+#   PATCH  /tasks/<id>                 edit: any of task, category, due, priority, status, repeat
+#   DELETE /tasks/<id>                 delete
+#   GET    /search?q=<query>           search titles (word prefixes, OR)
+#   GET    /stats                      statistics
+#   POST   /undo, POST /redo
+#
+# Writes are group-committed: requests arriving within SERVER_COMMIT_MS of
+# each other are applied in one store batch and made durable with a single
+# write, then all of them are answered. Each write is still its own undo step
+# and fails on its own (e.g. an unknown id) without affecting the others.
+
+SERVER_PORT = 8765
+SERVER_COMMIT_MS = 2
+MAX_GROUP = 256
+
+# Fields a request body may set; all are strings, repeat may also be null.
+ADD_FIELDS = ('task', 'category', 'due', 'priority', 'repeat')
+EDIT_FIELDS = ADD_FIELDS + ('status',)
+NULLABLE_FIELDS = ('repeat',)
+
+
+def check_fields(data, names):
+    # Bodies come from any client: a wrong type is a 400 before anything is
+    # queued, not an error inside someone else's commit group. Labels
+    # (priority, status, repeat) are checked by their parsers, also up front.
+    for name in names:
+        if name not in data or isinstance(data[name], str):
+            continue
+        if data[name] is None and name in NULLABLE_FIELDS:
+            continue
+        allowed = "a string or null" if name in NULLABLE_FIELDS else "a string"
+        raise ValueError(f"{name} must be {allowed}, not {type(data[name]).__name__}")
+
+
+class GroupCommitter:
+    def __init__(self, store, lock, undo_log, window=SERVER_COMMIT_MS / 1000):
+        self.store = store
+        self.lock = lock
+        self.undo_log = undo_log
+        self.window = window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, label, change):
+        # Runs change() in the next group; returns its result once durable.
+        future = Future()
+        self._queue.put((label, change, future))
+        return future.result()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        group = [first]
+        deadline = time.monotonic() + self.window
+        while len(group) < MAX_GROUP:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Stop after this group.
+                self._queue.put(None)
+                break
+            group.append(item)
+        return group
+
+    def _run(self):
+        while True:
+            group = self._collect()
+            if group is None:
+                return
+            results = []
+            try:
+                with self.lock, self.store.batch():
+                    for label, change, future in group:
+                        try:
+                            with self.undo_log.action(label):
+                                results.append((future, change(), None))
+                        except Exception as e:
+                            # Fails on its own; the rest of the group goes on.
+                            results.append((future, None, e))
+            except Exception as e:
+                # The group could not be written: nothing in it happened.
+                for _, _, future in group:
+                    future.set_exception(e)
+                continue
+            for future, result, error in results:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+class TaskService:
+    # The operations behind the HTTP routes, on already opened store objects.
+    def __init__(self, store, search_index, task_stats, undo_log, history, sorted_views,
+                 commit_ms=SERVER_COMMIT_MS):
+        self.store = store
+        self.search_index = search_index
+        self.task_stats = task_stats
+        self.sorted_views = sorted_views
+        self.undo_log = undo_log
+        self.history = history
+        # Readers take this lock too, so they never see half of a group.
+        self.lock = threading.RLock()
+        self.committer = GroupCommitter(store, self.lock, undo_log, commit_ms / 1000)
+
+    def _index(self, task_id):
+        try:
+            return self.store.index_of(task_id)
+        except KeyError:
+            raise LookupError(f"no task with id {task_id}") from None
+
+    # 🔎 Reads
+    def list(self, category=None, sort=None):
+        with self.lock:
+            self.store.refresh()
+            if sort:
+                tasks = self.sorted_views.view(sort)
+                if category:
+                    category = category.capitalize()
+                    tasks = (t for t in tasks if t.category.capitalize() == category)
+            else:
+                tasks = self.store.filter_by_category(category) if category else self.store.tasks
+            return [t.to_dict() for t in tasks]
+
+    def get(self, task_id):
+        with self.lock:
+            self.store.refresh()
+            return self.store.tasks[self._index(task_id)].to_dict()
+
+    def search(self, query):
+        with self.lock:
+            self.store.refresh()
+            return [self.store.get(i).to_dict() for i in sorted(self.search_index.search(query))]
+
+    def stats(self):
+        with self.lock:
+            self.store.refresh()
+            stats = self.task_stats.summary()
+            stats['by_priority'] = {Priority(k).label: n for k, n in stats['by_priority'].items()}
+            return stats
+
+    # ✍️ Writes, run by the group committer
+    def add(self, data):
+        check_fields(data, ADD_FIELDS)
+        priority = parse_priority(data.get('priority', 'Medium'))
+        repeat = parse_repeat(data.get('repeat'))
+
+        def change():
+            task = self.store.add(Task(
+                data.get('task', ''),
+                data.get('category', 'Other').capitalize(),
+                data.get('due', ''),
+                priority,
+                repeat=repeat,
+            ))
+            self.history.log("Added", task)
+            return task.to_dict()
+        return self.committer.submit("Add", change)
+
+    def complete(self, task_id):
+        def change():
+            task = self.store.update(self._index(task_id), {'status': Status.COMPLETED})
+            self.history.log("Completed", task)
+            return task.to_dict()
+        return self.committer.submit("Complete", change)
+
+    def edit(self, task_id, data):
+        check_fields(data, EDIT_FIELDS)
+        fields = {name: data[name] for name in ('task', 'category', 'due') if name in data}
+        if 'priority' in data:
+            fields['priority'] = parse_priority(data['priority'])
+        if 'status' in data:
+            fields['status'] = parse_status(data['status'])
+        if 'repeat' in data:
+            fields['repeat'] = parse_repeat(data['repeat'])
+
+        def change():
+            task = self.store.update(self._index(task_id), fields)
+            self.history.log("Edited", task)
+            return task.to_dict()
+        return self.committer.submit("Edit", change)
+
+    def delete(self, task_id):
+        def change():
+            task = self.store.delete(self._index(task_id))
+            self.history.log("Deleted", task)
+            return task.to_dict()
+        return self.committer.submit("Delete", change)
+
+    def undo(self, step):
+        # Not group-committed: undo and redo must not become undo steps.
+        with self.lock:
+            label = getattr(self.undo_log, step)()
+        if label is None:
+            raise ValueError(f"nothing to {step}")
+        return {step: label}
+
+    def close(self):
+        self.committer.close()
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests.
+    protocol_version = "HTTP/1.1"
+    server_version = "TodoList/1.0"
+    # Headers and body go out as separate writes; without TCP_NODELAY the
+    # body waits for the client's delayed ACK (~40ms per request).
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        data = json.loads(self.rfile.read(length))
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        service = self.server.service
+        if parts == ['tasks']:
+            if method == 'GET':
+                return service.list(query.get('category'), query.get('sort'))
+            if method == 'POST':
+                return service.add(self._body())
+        elif len(parts) >= 2 and parts[0] == 'tasks' and parts[1].isdigit():
+            task_id = int(parts[1])
+            if parts[2:] == ['complete'] and method == 'POST':
+                return service.complete(task_id)
+            if len(parts) == 2:
+                if method == 'GET':
+                    return service.get(task_id)
+                if method == 'PATCH':
+                    return service.edit(task_id, self._body())
+                if method == 'DELETE':
+                    return service.delete(task_id)
+        elif parts == ['search'] and method == 'GET':
+            return service.search(query.get('q', ''))
+        elif parts == ['stats'] and method == 'GET':
+            return service.stats()
+        elif parts in (['undo'], ['redo']) and method == 'POST':
+            return service.undo(parts[0])
+        raise LookupError(f"no route for {method} {url.path}")
+
+    def _handle(self, method):
+        try:
+            self._reply(200, self._route(method))
+        except LookupError as e:
+            self._reply(404, {'error': str(e)})
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+        except Exception as e:
+            self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def address_string(self):
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else "local"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixTaskRequestHandler(TaskRequestHandler):
+    # Not a TCP connection: nothing to tune.
+    disable_nagle_algorithm = False
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def make_server(service, host="127.0.0.1", port=SERVER_PORT, socket_path=None, verbose=False):
+    if socket_path:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not available here, use --port")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # left over from a server that did not shut down
+        server = UnixHTTPServer(socket_path, UnixTaskRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), TaskRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(service, host="127.0.0.1", port=SERVER_PORT, socket_path=None, verbose=False):
+    server = make_server(service, host, port, socket_path, verbose)
+    # `kill` shuts down as cleanly as Ctrl+C.
+    signal.signal(signal.SIGTERM, _interrupt)
+    where = socket_path or f"http://{host}:{server.server_port}"
+    print(f"serving tasks on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
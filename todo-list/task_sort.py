@@ -0,0 +1,175 @@
+from bisect import bisect_left
+from datetime import date
+
+from task_store import StoreListener
+
+# 🔀 Sorted views
+#
+# A sort spec is a list of fields, most significant first, each optionally
+# prefixed with '-' or suffixed with ':desc' for descending:
+# "priority,due,-category" or "priority,due,category:desc" (handy on the
+# command line, where a leading '-' reads as an option). Sorting is
+# stable, so tasks that tie on every field keep their order in the list.
+#
+# Each task's key for a spec is computed once, never per comparison: a
+# tuple of small ints and casefolded strings, with due dates as day numbers
+# and blank or malformed dates after all real ones in either direction.
+# Sorted views are cached per spec and kept up to date by store events:
+# deleting a task removes it from each view, adding one is a binary-search
+# insert, and an edit only touches the views whose spec uses an edited
+# field. Views never change the order of the task list itself; saving a
+# sorted order is an explicit store.reorder().
+
+NO_DATE = date.max.toordinal() + 1
+
+
+def _due(task):
+    return task.due_date.toordinal() if task.due_date is not None else NO_DATE
+
+
+SORT_FIELDS = {
+    'due': _due,
+    'priority': lambda t: int(t.priority),
+    'status': lambda t: int(t.status),
+    'category': lambda t: t.category.casefold(),
+    'task': lambda t: t.task.casefold(),
+    'id': lambda t: t.id,
+}
+
+# Menu numbers of the single-field sorts offered before sort specs existed.
+SORT_SHORTCUTS = {'1': 'due', '2': 'priority', '3': 'status'}
+
+
+_INVERT = bytes(range(255, -1, -1))
+
+
+def _descending(text):
+    # Fixed-width code points with every byte inverted sort in reverse; the
+    # all-ones terminator puts "ab" after "abc".
+    return text.encode('utf-32-be').translate(_INVERT) + b'\xff\xff\xff\xff'
+
+
+def parse_sort(spec):
+    # "priority, -due" or "priority,due:desc" -> (('priority', False),
+    # ('due', True)). ValueError for an unknown field or direction.
+    fields = []
+    for part in spec.replace(' ', ',').split(','):
+        if not part:
+            continue
+        part, _, direction = part.lower().partition(':')
+        part = SORT_SHORTCUTS.get(part, part)
+        if direction not in ('', 'asc', 'desc'):
+            raise ValueError(f"unknown sort direction {direction!r}, use asc or desc")
+        descending = part.startswith('-') or direction == 'desc'
+        name = part.lstrip('-+')
+        if name not in SORT_FIELDS:
+            raise ValueError(f"cannot sort by {name!r}, use {', '.join(SORT_FIELDS)}")
+        fields.append((name, descending))
+    if not fields:
+        raise ValueError("no sort fields given")
+    return tuple(fields)
+
+
+def format_sort(fields):
+    return ",".join(('-' if descending else '') + name for name, descending in fields)
+
+
+def sort_key(fields):
+    def component(name, descending):
+        key = SORT_FIELDS[name]
+        if not descending:
+            return key
+        if name == 'due':
+            # Missing dates stay last when the order is reversed.
+            return lambda t: (t.due_date is None, -_due(t))
+        if name in ('category', 'task'):
+            return lambda t: _descending(key(t))
+        return lambda t: -key(t)
+
+    keys = [component(name, descending) for name, descending in fields]
+    if len(keys) == 1:
+        return keys[0]
+    return lambda t: tuple(k(t) for k in keys)
+
+
+class SortedView:
+    # Entries are (key, rank) with rank the task's place in the task list,
+    # so ties keep list order and every entry is unique for bisect.
+    def __init__(self, tasks, fields):
+        self.fields = fields
+        self.names = {name for name, _ in fields}
+        self.key = sort_key(fields)
+        tasks = list(tasks)
+        keys = [self.key(t) for t in tasks]
+        # Sorting positions by key is stable, so ties keep list order.
+        order = sorted(range(len(tasks)), key=keys.__getitem__)
+        self.entries = [(keys[n], n) for n in order]
+        self.tasks = [tasks[n] for n in order]
+        self._filed = {t.id: entry for t, entry in zip(self.tasks, self.entries)}
+        self._next_rank = len(tasks)
+
+    def insert(self, task, rank=None):
+        if rank is None:
+            rank = self._next_rank
+            self._next_rank += 1
+        entry = (self.key(task), rank)
+        position = bisect_left(self.entries, entry)
+        self.entries.insert(position, entry)
+        self.tasks.insert(position, task)
+        self._filed[task.id] = entry
+
+    def remove(self, task):
+        # Returns the task's rank, to file it again after an edit.
+        entry = self._filed.pop(task.id)
+        position = bisect_left(self.entries, entry)
+        del self.entries[position]
+        del self.tasks[position]
+        return entry[1]
+
+
+class SortedViews(StoreListener):
+    def __init__(self, store):
+        self.store = store
+        self._views = {}
+
+    def view(self, spec):
+        # The tasks in the order of `spec` (a string or parse_sort() result),
+        # as a list that must not be modified.
+        fields = parse_sort(spec) if isinstance(spec, str) else tuple(spec)
+        view = self._views.get(fields)
+        if view is None:
+            view = self._views[fields] = SortedView(self.store.tasks, fields)
+        return view.tasks
+
+    # 👂 Store events
+    def on_add(self, task):
+        tasks = self.store.tasks
+        if tasks and tasks[-1] is task:
+            for view in self._views.values():
+                view.insert(task)
+        else:
+            # Put back in the middle (undo): ties would no longer follow the
+            # list order, so start over.
+            self._views.clear()
+
+    def on_update(self, task, old):
+        for view in self._views.values():
+            if not view.names.isdisjoint(old):
+                view.insert(task, view.remove(task))
+
+    def on_delete(self, task, index):
+        for view in self._views.values():
+            view.remove(task)
+
+    def on_reorder(self, tasks, old_order):
+        # Ties follow the list order, which just changed.
+        self._views.clear()
+
+    def on_reset(self, tasks, old_tasks):
+        self._views.clear()
+
+
+def open_views(store):
+    views = SortedViews(store)
+    store.subscribe(views)
+    return views
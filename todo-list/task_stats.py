@@ -0,0 +1,96 @@
+from datetime import datetime
+
+from task_model import Status
+from task_store import StoreListener, count_tasks
+
+# 📊 Incrementally maintained task statistics
+#
+# Counts by status, category and priority are adjusted by each store event,
+# so showing statistics never walks the task list. Overdue tasks are tracked
+# as a count of unfinished tasks per due date: the overdue total is cached
+# for the current day and only re-summed (over distinct dates, not tasks)
+# when the calendar day changes. The counts are taken from the store the
+# first time statistics are asked for; events before then are already in
+# them and are ignored.
+
+
+STAT_FIELDS = {'status', 'category', 'priority', 'due'}
+
+
+class TaskStats(StoreListener):
+    def __init__(self, store):
+        self.store = store
+        self.seeded = False
+
+    def _ensure(self):
+        if not self.seeded:
+            self._seed(self.store.counts())
+
+    def _seed(self, counts):
+        self.seeded = True
+        self.by_status = counts['status']
+        self.by_category = counts['category']
+        self.by_priority = counts['priority']
+        self.open_due = dict(counts['open_due'])
+        self._today = None
+        self._overdue = 0
+
+    # 🧮 Counting
+    def _count(self, task, sign):
+        self.by_status[task.status] += sign
+        self.by_category[task.category.capitalize()] += sign
+        self.by_priority[task.priority] += sign
+        if task.status != Status.COMPLETED:
+            date = task.due_date
+            if date is not None:
+                self.open_due[date] = self.open_due.get(date, 0) + sign
+                if not self.open_due[date]:
+                    del self.open_due[date]
+                if self._today is not None and date < self._today:
+                    self._overdue += sign
+
+    def overdue(self):
+        self._ensure()
+        today = datetime.now().date()
+        if today != self._today:
+            self._today = today
+            self._overdue = sum(n for date, n in self.open_due.items() if date < today)
+        return self._overdue
+
+    def summary(self):
+        self._ensure()
+        return {
+            'total': sum(self.by_status.values()),
+            'completed': self.by_status[Status.COMPLETED],
+            'pending': self.by_status[Status.PENDING],
+            'in_progress': self.by_status[Status.IN_PROGRESS],
+            'overdue': self.overdue(),
+            'by_category': {k: n for k, n in self.by_category.items() if n},
+            'by_priority': {k: n for k, n in self.by_priority.items() if n},
+        }
+
+    # 👂 Store events
+    def on_add(self, task):
+        if self.seeded:
+            self._count(task, 1)
+
+    def on_update(self, task, old):
+        if self.seeded and STAT_FIELDS & old.keys():
+            before = task.copy()
+            before.update(old)
+            self._count(before, -1)
+            self._count(task, 1)
+
+    def on_delete(self, task, index):
+        if self.seeded:
+            self._count(task, -1)
+
+    def on_reset(self, tasks, old_tasks):
+        if self.seeded:
+            self._seed(count_tasks(tasks))
+
+
+def open_stats(store):
+    stats = TaskStats(store)
+    store.subscribe(stats)
+    return stats
@@ -0,0 +1,973 @@
+import os
+import json
+import marshal
+import uuid
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from task_model import Task, Priority, Status, parse_due, fields_to_dict, fields_from_dict
+from task_view import LazyView
+from file_lock import FileLock
+from task_metrics import metrics
+
+# 🗄️ Task stores
+#
+# A store owns the in-memory list of Task records used by the menu
+# (store.tasks) and persists every mutation. Two backends are available, picked with the
+# "storage" key in settings.json:
+#
+#   "journal" - tasks.json snapshot plus an append-only tasks.journal
+#   "sqlite"  - tasks.db with indexes on category, status, due and priority
+#
+# Filtering and statistics go through the store so each backend can answer
+# them in the cheapest way it has. Derived structures (like the search index
+# or the sorted views) subscribe to the store and are told about every change.
+
+
+def file_fingerprint(paths):
+    # Empty files are skipped so a freshly created, still empty journal or
+    # WAL file does not count as a change.
+    stamp = []
+    for path in paths:
+        if os.path.exists(path):
+            st = os.stat(path)
+            if st.st_size:
+                stamp.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return stamp
+
+
+# 👂 Change notifications
+class StoreListener:
+    def on_add(self, task):
+        pass
+
+    def on_update(self, task, old):
+        # `old` maps each changed field to its previous value.
+        pass
+
+    def on_delete(self, task, index):
+        # `index` is where the task was in the list before it was removed.
+        pass
+
+    def on_reorder(self, tasks, old_order):
+        # `old_order` lists the task ids in their previous order.
+        pass
+
+    def on_reset(self, tasks, old_tasks):
+        pass
+
+
+# 📊 Aggregate counts, used to seed the statistics (see task_stats.py).
+# 'open_due' counts unfinished tasks per parsed due date.
+def count_tasks(tasks):
+    counts = {
+        'status': Counter(),
+        'category': Counter(),
+        'priority': Counter(),
+        'open_due': Counter(),
+    }
+    for t in tasks:
+        counts['status'][t.status] += 1
+        counts['category'][t.category.capitalize()] += 1
+        counts['priority'][t.priority] += 1
+        if t.status != Status.COMPLETED and t.due_date is not None:
+            counts['open_due'][t.due_date] += 1
+    return counts
+
+
+class ConflictError(ValueError):
+    # Raised when another session changed or deleted the task in between.
+    pass
+
+
+class TaskStore:
+    read_only = False
+    # Whether a batch that raises is rolled back as a whole (SQLite), or
+    # keeps the changes made before the error (journal).
+    atomic_batches = False
+
+    def __init__(self):
+        self.tasks = []
+        self._by_id = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._exclusive_depth = 0
+        # True while changes made by other sessions are being applied.
+        self.syncing = False
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def _notify(self, event, *args):
+        for listener in self.listeners:
+            getattr(listener, 'on_' + event)(*args)
+
+    def fingerprint(self):
+        return file_fingerprint(self.files())
+
+    def synced_fingerprint(self):
+        # The fingerprint of exactly the state held in memory: other
+        # sessions' changes are applied first, and cannot land in between
+        # because the files are locked. Use it to stamp anything derived
+        # from store.tasks (search index, tasks.bin).
+        with self._exclusive():
+            return self.fingerprint()
+
+    def _reindex(self):
+        self._by_id = {}
+        used = {t.id for t in self.tasks if isinstance(t.id, int)}
+        self._next_id = max(used, default=0) + 1
+        for task in self.tasks:
+            if not isinstance(task.id, int) or task.id in self._by_id:
+                task.id = self._next_id
+                self._next_id += 1
+            self._by_id[task.id] = task
+
+    def insert(self, index, task):
+        return self.add(task, index)
+
+    def get(self, task_id):
+        return self._by_id[task_id]
+
+    def index_of(self, task_id):
+        return self.tasks.index(self._by_id[task_id])
+
+    # 🔒 Cross-process access: every mutation runs inside _exclusive(), which
+    # locks out other sessions and first applies whatever they changed. The
+    # mutation is then checked against what this session last saw
+    # (_current) so concurrent edits of different fields merge, while edits
+    # of the same field raise ConflictError instead of silently winning.
+    @contextmanager
+    def _exclusive(self):
+        with self._lock:
+            if self._exclusive_depth:
+                self._exclusive_depth += 1
+                try:
+                    yield
+                finally:
+                    self._exclusive_depth -= 1
+                return
+            self._acquire()
+            self._exclusive_depth = 1
+            ok = False
+            try:
+                yield
+                ok = True
+            finally:
+                self._exclusive_depth = 0
+                self._release(ok)
+
+    def _acquire(self):
+        pass
+
+    def _release(self, ok):
+        pass
+
+    def refresh(self):
+        # Pick up changes other sessions made since the last call.
+        with self._exclusive():
+            pass
+
+    def _current(self, task_id, expected):
+        task = self._by_id.get(task_id)
+        if task is None:
+            raise ConflictError(f"task {task_id} was deleted in another session")
+        changed = [name for name, value in expected.items() if getattr(task, name) != value]
+        if changed:
+            raise ConflictError(f"task {task_id} was changed in another session ({', '.join(changed)})")
+        return task
+
+    def _apply_remote(self, apply):
+        self.syncing = True
+        try:
+            apply()
+        finally:
+            self.syncing = False
+
+    # 📦 Batching: mutations inside `with store.batch():` are applied in
+    # memory right away but made durable with a single write when the
+    # outermost batch ends. Other sessions wait until then.
+    @contextmanager
+    def batch(self):
+        with self._exclusive():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_batch()
+
+    def _flush_batch(self):
+        pass
+
+    # 🔎 Queries
+    def filter_by_category(self, category):
+        category = category.capitalize()
+        return LazyView(t for t in self.tasks if t.category.capitalize() == category)
+
+    def counts(self):
+        return count_tasks(self.tasks)
+
+    # 🔀 Ordering (sorted orders come from task_sort.py)
+    def reorder(self, ids):
+        # Put tasks back in the order of `ids`; tasks not listed keep their
+        # relative order at the end.
+        rank = {task_id: n for n, task_id in enumerate(ids)}
+        self._arrange(lambda t: rank.get(t.id, len(rank)))
+
+    def _arrange(self, key):
+        with self._exclusive():
+            old_order = [t.id for t in self.tasks]
+            self.tasks.sort(key=key)
+            self._save_all()
+            self._notify('reorder', self.tasks, old_order)
+
+
+# 📒 Append-only journaled task store
+#
+# tasks.json stays a plain JSON list (the snapshot). Every mutation appends a
+# single JSON line to tasks.journal, so one edit costs O(1) disk writes no
+# matter how many tasks exist. On startup the snapshot is loaded and the
+# journal replayed on top of it. Once the journal grows past
+# COMPACT_THRESHOLD records it is rotated to tasks.journal.compacting and a
+# background thread writes the folded snapshot, which is swapped in at the
+# session's next write.
+#
+# Every task carries a stable integer 'id' and journal records refer to tasks
+# by id, so replaying a record twice (e.g. after a crash in the middle of a
+# compaction) is harmless.
+#
+# Several sessions can share the files. Writes happen under tasks.lock; before
+# writing, a session reads the journal records other sessions appended since
+# its last look. A snapshot or compaction always starts a new journal file,
+# so a session whose open journal is no longer the one on disk reloads
+# everything instead.
+
+COMPACT_THRESHOLD = 1000
+
+
+def _atomic_write_json(path, tasks, cache_path=None):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump([t.to_dict() for t in tasks], f, indent=4)
+        metrics.add_io('snapshot', written=f.tell())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if cache_path:
+        _write_cache(cache_path, _snapshot_stamp(path), tasks)
+
+
+# 🧊 Snapshot cache
+#
+# Parsing tasks.json is most of the cost of opening a large journal store.
+# tasks.cache holds the same tasks as marshalled columns, stamped with the
+# size, mtime and inode of the tasks.json they came from, and load() uses it
+# whenever the stamp still matches. A compacted snapshot keeps its stamp
+# when it is renamed into place. The cache is only ever written from tasks
+# just read from or written to tasks.json, so deleting it is always safe.
+
+CACHE_VERSION = 1
+
+
+def _snapshot_stamp(path):
+    st = os.stat(path)
+    return [CACHE_VERSION, marshal.version, st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _write_cache(cache_path, stamp, tasks):
+    columns = [
+        [t.id for t in tasks],
+        [t.task for t in tasks],
+        [t.category for t in tasks],
+        [t.due for t in tasks],
+        [int(t.priority) for t in tasks],
+        [int(t.status) for t in tasks],
+        [t.repeat for t in tasks],
+    ]
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((stamp, columns), f)
+            metrics.add_io('snapshot cache', written=f.tell())
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # No cache just means the next start parses tasks.json again.
+        pass
+
+
+def _read_cache(cache_path, stamp):
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        cached_stamp, columns = marshal.loads(data)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cached_stamp != stamp:
+        return None
+    metrics.add_io('snapshot cache', read=len(data))
+    priorities = list(Priority)
+    statuses = list(Status)
+    return [Task(title, category, due, priorities[priority], statuses[status], task_id, repeat)
+            for task_id, title, category, due, priority, status, repeat in zip(*columns)]
+
+
+def _read_snapshot(path, cache_path, write_cache=True):
+    stamp = _snapshot_stamp(path)
+    tasks = _read_cache(cache_path, stamp)
+    if tasks is None:
+        with open(path) as f:
+            tasks = [Task.from_dict(t) for t in json.load(f)]
+            metrics.add_io('snapshot', read=f.tell())
+        if write_cache:
+            _write_cache(cache_path, stamp, tasks)
+    return tasks
+
+
+def _file_id(st):
+    return (st.st_dev, st.st_ino)
+
+
+class JournalStore(TaskStore):
+    def __init__(self, path, compact_threshold=COMPACT_THRESHOLD, writable=True):
+        super().__init__()
+        # writable=False only loads (see read_tasks()): no lock, journal or
+        # cache file is created, and the store cannot be changed.
+        self.writable = writable
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + '.journal'
+        self.compacting_path = self.journal_path + '.compacting'
+        self.cache_path = os.path.splitext(path)[0] + '.cache'
+        self.next_path = f"{path}.{os.getpid()}.next"
+        self.compact_threshold = compact_threshold
+        self._file_lock = FileLock(os.path.splitext(path)[0] + '.lock') if writable else None
+        self._journal = None
+        self._journal_records = 0
+        self._offset = 0
+        self._pending = []
+        self._compactor = None
+        self._compacting_id = None
+        if writable:
+            with self._file_lock:
+                self.load()
+        else:
+            self.load()
+
+    # 📥 Loading
+    def load(self):
+        with self._lock:
+            tasks = []
+            if os.path.exists(self.path):
+                tasks = _read_snapshot(self.path, self.cache_path, self.writable)
+            # In place, so callers holding store.tasks see reloads.
+            self.tasks[:] = tasks
+            self._reindex()
+            if os.path.exists(self.compacting_path):
+                with open(self.compacting_path, 'rb') as f:
+                    data = f.read()
+                self._replay(data)
+                metrics.add_io('journal', read=len(data))
+            if self.writable:
+                self._open_journal()
+                self._read_journal()
+            elif os.path.exists(self.journal_path):
+                with open(self.journal_path, 'rb') as f:
+                    data = f.read()
+                self._replay(data)
+                metrics.add_io('journal', read=len(data))
+
+    def _replay(self, data):
+        # Applies the complete lines in `data`; returns (records, bytes used).
+        count = used = 0
+        while True:
+            end = data.find(b'\n', used)
+            if end < 0:
+                # Torn final line from a crash mid-append: left for later.
+                return count, used
+            line = data[used:end]
+            used = end + 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(record)
+            count += 1
+
+    def _read_journal(self):
+        self._journal.seek(self._offset)
+        data = self._journal.read()
+        count, used = self._replay(data)
+        metrics.add_io('journal', read=len(data))
+        self._offset += used
+        self._journal_records += count
+
+    def _apply(self, record):
+        op = record['op']
+        if op == 'add':
+            task = record['task']
+            if not isinstance(task, Task):
+                task = Task.from_dict(task)
+            if task.id in self._by_id:
+                return
+            before = self._by_id.get(record.get('before'))
+            if before is None:
+                self.tasks.append(task)
+            else:
+                self.tasks.insert(self.tasks.index(before), task)
+            self._by_id[task.id] = task
+            self._next_id = max(self._next_id, task.id + 1)
+            self._notify('add', task)
+        elif op == 'update':
+            task = self._by_id.get(record['id'])
+            if task is not None:
+                fields = fields_from_dict(record['fields'])
+                old = task.fields(fields)
+                task.update(fields)
+                self._notify('update', task, old)
+        elif op == 'delete':
+            task = self._by_id.pop(record['id'], None)
+            if task is not None:
+                index = self.tasks.index(task)
+                del self.tasks[index]
+                self._notify('delete', task, index)
+
+    # 🔒 Other sessions
+    def _acquire(self):
+        self._file_lock.acquire()
+        try:
+            self._reap_compactor()
+            self._sync()
+        except BaseException:
+            self._file_lock.release()
+            raise
+
+    def _release(self, ok):
+        self._file_lock.release()
+
+    def _sync(self):
+        try:
+            on_disk = _file_id(os.stat(self.journal_path))
+        except FileNotFoundError:
+            on_disk = None
+        if on_disk != _file_id(os.fstat(self._journal.fileno())):
+            # A snapshot or compaction replaced the journal: start over.
+            old_tasks = list(self.tasks)
+            self._apply_remote(self.load)
+            self._apply_remote(lambda: self._notify('reset', self.tasks, old_tasks))
+        else:
+            self._apply_remote(self._read_journal)
+
+    # ✍️ Journal
+    def _open_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'ab+')
+        self._offset = 0
+        self._journal_records = 0
+
+    def _append(self, *records):
+        if self._batch_depth:
+            self._pending.extend(records)
+            return
+        lines = []
+        for record in records:
+            if 'task' in record:
+                record = dict(record, task=record['task'].to_dict())
+            lines.append(json.dumps(record) + '\n')
+        data = ''.join(lines).encode('utf-8')
+        self._journal.write(data)
+        metrics.add_io('journal', written=len(data))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        # _sync() read up to the end under the same lock, so this is the end.
+        self._offset += len(data)
+        self._journal_records += len(records)
+        if self._journal_records >= self.compact_threshold:
+            self.compact()
+
+    def _flush_batch(self):
+        if self._pending:
+            records, self._pending = self._pending, []
+            self._append(*records)
+
+    def _commit(self, record):
+        self._apply(record)
+        self._append(record)
+
+    # 🛠️ Mutations
+    def add(self, task, index=None):
+        with self._lock:
+            before = self.tasks[index].id if index is not None and index < len(self.tasks) else None
+            with self._exclusive():
+                task = task.copy()
+                if not isinstance(task.id, int) or task.id in self._by_id:
+                    task.id = self._next_id
+                record = {'op': 'add', 'task': task}
+                if before in self._by_id:
+                    record['before'] = before
+                self._commit(record)
+                return task
+
+    def add_many(self, tasks):
+        # Bulk append (imports): one journal write and one fsync per batch.
+        with self._exclusive():
+            records = []
+            for task in tasks:
+                if not isinstance(task.id, int) or task.id in self._by_id:
+                    task.id = self._next_id
+                record = {'op': 'add', 'task': task}
+                self._apply(record)
+                records.append(record)
+            if records:
+                self._append(*records)
+
+    def update(self, index, fields):
+        with self._lock:
+            task = self.tasks[index]
+            expected = task.fields(fields)
+            with self._exclusive():
+                task = self._current(task.id, expected)
+                self._commit({'op': 'update', 'id': task.id, 'fields': fields_to_dict(fields)})
+                return task
+
+    def delete(self, index):
+        with self._lock:
+            task = self.tasks[index]
+            with self._exclusive():
+                task = self._current(task.id, {})
+                self._commit({'op': 'delete', 'id': task.id})
+                return task
+
+    def replace(self, tasks):
+        # Whole-list changes (sort, restore) are written as a new snapshot.
+        with self._exclusive():
+            old_tasks = list(self.tasks)
+            if tasks is not self.tasks:
+                self.tasks[:] = [t.copy() for t in tasks]
+            self._reindex()
+            self._save_all()
+            self._notify('reset', self.tasks, old_tasks)
+
+    def files(self):
+        return [self.path, self.journal_path, self.compacting_path]
+
+    def synced_fingerprint(self):
+        with self._exclusive():
+            # A compaction finishing later would change the files again.
+            self._reap_compactor(wait=True)
+            return super().synced_fingerprint()
+
+    # 🗜️ Compaction
+    def _save_all(self):
+        self._reap_compactor(wait=True)
+        self._write_snapshot()
+
+    def _write_snapshot(self):
+        # Under the file lock. The fresh journal tells other sessions to reload.
+        _atomic_write_json(self.path, self.tasks, self.cache_path)
+        self._pending = []
+        self._journal.close()
+        self._journal = None
+        tmp_path = self.journal_path + '.tmp'
+        open(tmp_path, 'wb').close()
+        os.replace(tmp_path, self.journal_path)
+        if os.path.exists(self.compacting_path):
+            os.remove(self.compacting_path)
+        self._open_journal()
+
+    def compact(self):
+        with self._exclusive():
+            if self._compactor is not None:
+                return
+            if os.path.exists(self.compacting_path):
+                # Left by another session, or by one that crashed: fold
+                # everything into a snapshot right away.
+                self._write_snapshot()
+                return
+            snapshot = [t.copy() for t in self.tasks]
+            self._journal.close()
+            self._journal = None
+            os.replace(self.journal_path, self.compacting_path)
+            self._compacting_id = _file_id(os.stat(self.compacting_path))
+            self._open_journal()
+            self._compactor = threading.Thread(
+                target=_atomic_write_json, args=(self.next_path, snapshot, self.cache_path),
+                name='task-compactor'
+            )
+            self._compactor.start()
+
+    def _reap_compactor(self, wait=False):
+        # Under the file lock: swap in the snapshot the compactor wrote, as
+        # long as the journal it folded is still the one waiting for it.
+        if self._compactor is None or (self._compactor.is_alive() and not wait):
+            return
+        self._compactor.join()
+        self._compactor = None
+        try:
+            current = _file_id(os.stat(self.compacting_path))
+        except FileNotFoundError:
+            current = None
+        if current == self._compacting_id and os.path.exists(self.next_path):
+            os.replace(self.next_path, self.path)
+            os.remove(self.compacting_path)
+        elif os.path.exists(self.next_path):
+            os.remove(self.next_path)
+
+    def close(self):
+        if not self.writable:
+            return
+        with self._lock:
+            with self._file_lock:
+                self._reap_compactor(wait=True)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._file_lock.close()
+
+
+# 🗄️ SQLite task store
+#
+# Rows keep their menu order in 'position'. Priority and status are stored as
+# their enum values, which are also their sort ranks, so ORDER BY on them
+# matches the menu's sort order. Every index ends in 'position', which lets category
+# filters come back in menu order and keeps sorts stable, straight from the
+# index. store_state holds the database's id and a counter bumped by every
+# transaction that changed something: the store's fingerprint, which (unlike
+# the size and mtime of tasks.db) survives WAL checkpoints.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    category TEXT NOT NULL,
+    due TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    repeat TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category COLLATE NOCASE, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(due, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority, position);
+CREATE TABLE IF NOT EXISTS store_state (
+    id TEXT NOT NULL,
+    changes INTEGER NOT NULL
+);
+"""
+SCHEMA_VERSION = 1
+
+def _to_row(task):
+    return (task.task, task.category, task.due, int(task.priority), int(task.status), task.repeat)
+
+
+class SqliteStore(TaskStore):
+    atomic_batches = True
+
+    def __init__(self, path, import_from=None):
+        super().__init__()
+        self.path = path
+        import sqlite3  # only this backend needs it
+        # Other sessions hold the write lock only briefly; wait for them.
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._data_version = None
+        self._begin_changes = 0
+        # Upgrades and the first-run import happen in one write transaction,
+        # so sessions opening a new database at the same time cannot both
+        # import (and wipe what the other added meanwhile).
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(tasks)")}
+            if 'repeat' not in columns:
+                # Databases created before recurring tasks.
+                self._db.execute("ALTER TABLE tasks ADD COLUMN repeat TEXT NOT NULL DEFAULT ''")
+            if self._db.execute("SELECT 1 FROM store_state").fetchone() is None:
+                self._db.execute("INSERT INTO store_state VALUES (?, 0)", (uuid.uuid4().hex,))
+        except BaseException:
+            self._db.rollback()
+            raise
+        with self._exclusive():
+            if not self._db.execute("PRAGMA user_version").fetchone()[0]:
+                # user_version marks a database that went through this once.
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                if not self.tasks and import_from and os.path.exists(import_from):
+                    # First run on SQLite: bring over the existing JSON task
+                    # list, only reading it (no journal-backend files appear).
+                    self.replace(read_tasks(import_from)[0])
+
+    # 🔒 Other sessions: SQLite does the locking. A write transaction starts
+    # with BEGIN IMMEDIATE, and PRAGMA data_version tells whether another
+    # connection committed since this session last read the table.
+    def _acquire(self):
+        if not self._db.in_transaction:
+            self._db.execute("BEGIN IMMEDIATE")
+        self._begin_changes = self._db.total_changes
+        self._refresh()
+
+    def _release(self, ok):
+        if ok:
+            if self._db.total_changes != self._begin_changes:
+                self._db.execute("UPDATE store_state SET changes = changes + 1")
+            self._db.commit()
+        else:
+            self._db.rollback()
+            # Memory may be ahead of the rolled back table now.
+            self._data_version = None
+
+    def _refresh(self):
+        version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            old_tasks = list(self.tasks)
+            self._apply_remote(self.load)
+            if self._data_version is not None:
+                self._apply_remote(lambda: self._notify('reset', self.tasks, old_tasks))
+            self._data_version = version
+
+    def refresh(self):
+        # Reading needs no write lock.
+        with self._lock:
+            self._refresh()
+
+    # 📥 Loading
+    def load(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, task, category, due, priority, status, repeat FROM tasks ORDER BY position"
+            )
+            # In place, so callers holding store.tasks see reloads.
+            self.tasks[:] = [
+                Task(row[1], row[2], row[3], Priority(row[4]), Status(row[5]), row[0], row[6])
+                for row in rows
+            ]
+            self._reindex()
+            last = self._db.execute("SELECT MAX(position) FROM tasks").fetchone()[0]
+            self._next_position = 0 if last is None else last + 1
+            self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    # 🛠️ Mutations
+    def add(self, task, index=None):
+        with self._lock:
+            before = self.tasks[index].id if index is not None and index < len(self.tasks) else None
+            with self._exclusive():
+                task = task.copy()
+                if not isinstance(task.id, int) or task.id in self._by_id:
+                    task.id = self._next_id
+                if before in self._by_id:
+                    position = self._db.execute(
+                        "SELECT position FROM tasks WHERE id = ?", (before,)
+                    ).fetchone()[0]
+                    self._db.execute(
+                        "UPDATE tasks SET position = position + 1 WHERE position >= ?", (position,)
+                    )
+                    self._next_position += 1
+                    self.tasks.insert(self.tasks.index(self._by_id[before]), task)
+                else:
+                    position = self._next_position
+                    self._next_position += 1
+                    self.tasks.append(task)
+                self._db.execute(
+                    "INSERT INTO tasks (id, position, task, category, due, priority, status, repeat) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (task.id, position) + _to_row(task),
+                )
+                self._by_id[task.id] = task
+                self._next_id = max(self._next_id, task.id + 1)
+        self._notify('add', task)
+        return task
+
+    def add_many(self, tasks):
+        with self._exclusive():
+            rows = []
+            for task in tasks:
+                if not isinstance(task.id, int) or task.id in self._by_id:
+                    task.id = self._next_id
+                self._next_id = max(self._next_id, task.id + 1)
+                self._by_id[task.id] = task
+                self.tasks.append(task)
+                rows.append((task.id, self._next_position) + _to_row(task))
+                self._next_position += 1
+            self._db.executemany(
+                "INSERT INTO tasks (id, position, task, category, due, priority, status, repeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        for task in tasks:
+            self._notify('add', task)
+
+    def update(self, index, fields):
+        with self._lock:
+            fields = {k: v for k, v in fields.items() if k in Task.FIELDS}
+            task = self.tasks[index]
+            expected = task.fields(fields)
+            with self._exclusive():
+                task = self._current(task.id, expected)
+                if fields:
+                    assignments = ", ".join(f"{k} = ?" for k in fields)
+                    self._db.execute(
+                        f"UPDATE tasks SET {assignments} WHERE id = ?",
+                        list(fields.values()) + [task.id],
+                    )
+                old = task.fields(fields)
+                task.update(fields)
+        self._notify('update', task, old)
+        return task
+
+    def delete(self, index):
+        with self._lock:
+            task = self.tasks[index]
+            with self._exclusive():
+                task = self._current(task.id, {})
+                index = self.tasks.index(task)
+                del self.tasks[index]
+                del self._by_id[task.id]
+                self._db.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+        self._notify('delete', task, index)
+        return task
+
+    def replace(self, tasks):
+        with self._exclusive():
+            old_tasks = list(self.tasks)
+            if tasks is not self.tasks:
+                self.tasks[:] = [t.copy() for t in tasks]
+            self._reindex()
+            self._db.execute("DELETE FROM tasks")
+            self._db.executemany(
+                "INSERT INTO tasks (id, position, task, category, due, priority, status, repeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((t.id, pos) + _to_row(t) for pos, t in enumerate(self.tasks)),
+            )
+            self._next_position = len(self.tasks)
+        self._notify('reset', self.tasks, old_tasks)
+
+    def _arrange(self, key):
+        with self._exclusive():
+            old_order = [t.id for t in self.tasks]
+            self.tasks.sort(key=key)
+            self._db.executemany(
+                "UPDATE tasks SET position = ? WHERE id = ?",
+                ((pos, t.id) for pos, t in enumerate(self.tasks)),
+            )
+            self._next_position = len(self.tasks)
+        self._notify('reorder', self.tasks, old_order)
+
+    # 🔎 Queries
+    def _select(self, where, params):
+        # Only ids come back from SQLite; Task records are looked up as the
+        # view is paged through.
+        ids = [row[0] for row in self._db.execute(
+            f"SELECT id FROM tasks WHERE {where} ORDER BY position", params
+        )]
+        return LazyView((self._by_id[i] for i in ids), len(ids))
+
+    def filter_by_category(self, category):
+        with self._lock:
+            self._refresh()
+            return self._select("category = ? COLLATE NOCASE", (category,))
+
+    def counts(self):
+        # Each GROUP BY walks one of the column indexes.
+        counts = {
+            'status': Counter(),
+            'category': Counter(),
+            'priority': Counter(),
+            'open_due': Counter(),
+        }
+        with self._lock:
+            for status, n in self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts['status'][Status(status)] += n
+            for category, n in self._db.execute(
+                "SELECT category, COUNT(*) FROM tasks GROUP BY category COLLATE NOCASE"
+            ):
+                counts['category'][category.capitalize()] += n
+            for priority, n in self._db.execute("SELECT priority, COUNT(*) FROM tasks GROUP BY priority"):
+                counts['priority'][Priority(priority)] += n
+            for due, n in self._db.execute(
+                "SELECT due, COUNT(*) FROM tasks WHERE status != ? GROUP BY due",
+                (int(Status.COMPLETED),),
+            ):
+                due_date = parse_due(due)
+                if due_date is not None:
+                    counts['open_due'][due_date] += n
+        return counts
+
+    def files(self):
+        return [self.path, self.path + '-wal']
+
+    def fingerprint(self):
+        # Not the files' size and mtime: closing checkpoints the WAL into
+        # tasks.db, so those would never match at the next start.
+        with self._lock:
+            db_id, changes = self._db.execute("SELECT id, changes FROM store_state").fetchone()
+        return [os.path.basename(self.path), db_id, changes]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# 🔌 Backend selection
+def open_store(path, backend="journal"):
+    if backend == "sqlite":
+        return SqliteStore(os.path.splitext(path)[0] + '.db', import_from=path)
+    return JournalStore(path)
+
+
+def _read_sqlite(db_path):
+    # Rows of an existing tasks.db, opened read-only. Without a -wal file
+    # everything is in tasks.db, and opening it immutable keeps SQLite from
+    # creating -wal/-shm files; read_tasks() notices a writer starting.
+    import sqlite3
+    from urllib.request import pathname2url
+    mode = "ro" if os.path.exists(db_path + '-wal') else "ro&immutable=1"
+    db = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode={mode}", uri=True)
+    try:
+        columns = {row[1] for row in db.execute("PRAGMA table_info(tasks)")}
+        repeat = "repeat" if 'repeat' in columns else "''"
+        rows = db.execute(
+            f"SELECT id, task, category, due, priority, status, {repeat} FROM tasks ORDER BY position"
+        ).fetchall()
+    finally:
+        db.close()
+    return [Task(row[1], row[2], row[3], Priority(row[4]), Status(row[5]), row[0], row[6]) for row in rows]
+
+
+READ_ATTEMPTS = 5
+
+
+def read_tasks(path, backend="journal"):
+    # The tasks open_store(path, backend) would load, and the fingerprint of
+    # the files they were read from, without creating or changing any file
+    # (no lock, journal, cache or database), for read-only viewers. Writers
+    # are not locked out, so the read is repeated until the files stayed the
+    # same while it ran; if they never do, the fingerprint is None.
+    files = store_files(path, backend)
+    db_path = os.path.splitext(path)[0] + '.db'
+    for _ in range(READ_ATTEMPTS):
+        before = file_fingerprint(files)
+        if backend == "sqlite" and os.path.exists(db_path):
+            tasks = _read_sqlite(db_path)
+        elif os.path.exists(path) or backend != "sqlite":
+            # Before its first run the SQLite store would import tasks.json.
+            tasks = JournalStore(path, writable=False).tasks
+        else:
+            tasks = []
+        if file_fingerprint(files) == before:
+            return tasks, before
+    return tasks, None
+
+
+def store_files(path, backend="journal"):
+    # The files open_store(path, backend) keeps its tasks in, for callers
+    # that need the fingerprint without opening the store.
+    if backend == "sqlite":
+        db_path = os.path.splitext(path)[0] + '.db'
+        return [db_path, db_path + '-wal']
+    journal_path = os.path.splitext(path)[0] + '.journal'
+    return [path, journal_path, journal_path + '.compacting']
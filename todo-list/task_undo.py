@@ -0,0 +1,371 @@
+import os
+import json
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+from task_model import Task, fields_to_dict, fields_from_dict
+from task_store import StoreListener
+from file_lock import FileLock
+from task_metrics import metrics
+
+# ⏪ Multi-level undo/redo
+#
+# The undo log listens to the store and keeps, for every change, only the
+# delta that reverts it:
+#
+#   ['delete', id]               undoes an add
+#   ['update', id, old_fields]   undoes an edit (only the changed fields)
+#   ['add', task, index]         undoes a delete
+#   ['order', old_ids]           undoes a sort
+#   ['reset', old_tasks]         undoes a restore
+#
+# The changes made by one menu action are grouped with `with undo.action(...)`.
+# Undoing applies the group's deltas in reverse through the store; the store
+# events this produces are recorded as the redo group, and redoing does the
+# same in the other direction. Rolling back N operations therefore costs N
+# store updates, never a reload.
+#
+# Both stacks are bounded by a depth and by the size of their deltas, and
+# persisted as an append-only JSONL log (push/pop/drop/clear records) that is
+# replayed on startup and rewritten once it is mostly stale records.
+#
+# Every session shares the log, so the stacks are shared too. Each step gets
+# a unique id and pop/drop/clear records name the steps they remove, never a
+# position. Changing the stacks happens under tasks.undo.lock after reading
+# what other sessions appended since, so two sessions cannot undo the same
+# step; the lock is released before the step is applied to the store.
+
+UNDO_DEPTH = 50
+UNDO_MAX_BYTES = 1024 * 1024
+
+# Smallest JSON size of one task / one id, used to reject oversized deltas
+# (restoring or sorting a huge list) before serializing them.
+MIN_TASK_BYTES = 64
+MIN_ID_BYTES = 2
+
+EVENT_LABELS = {'delete': 'Add', 'update': 'Edit', 'add': 'Delete', 'order': 'Sort', 'reset': 'Restore'}
+
+
+class UndoLog(StoreListener):
+    def __init__(self, store, path, depth=UNDO_DEPTH, max_bytes=UNDO_MAX_BYTES):
+        self.store = store
+        self.path = path
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.stacks = {'undo': deque(), 'redo': deque()}
+        self.bytes = 0
+        self._group = None
+        self._group_bytes = 0
+        self._overflow = False
+        # True if the last action was too large to keep, which also cleared
+        # the history before it; callers tell the user.
+        self.overflowed = False
+        self._file = None
+        self._file_id = None
+        self._offset = 0
+        self._torn = False
+        self._records = 0
+        self._file_lock = FileLock(os.path.splitext(path)[0] + '.lock')
+        # True while undo/redo re-applies changes, so listeners reacting to
+        # a change (recurring tasks) do not react a second time.
+        self.replaying = False
+        self.load()
+
+    # 📥 Persistence
+    def load(self):
+        with self._file_lock:
+            self._open()
+            self._sync()
+            self._trim()
+            live = len(self.stacks['undo']) + len(self.stacks['redo'])
+            if self._records > 2 * live + 50:
+                self._rewrite()
+
+    def _open(self):
+        # (Re)read the log from the start, e.g. after another session
+        # rewrote it.
+        if self._file is not None:
+            self._file.close()
+        self.stacks = {'undo': deque(), 'redo': deque()}
+        self.bytes = 0
+        self._records = 0
+        self._offset = 0
+        self._file = open(self.path, 'ab+')
+        st = os.fstat(self._file.fileno())
+        self._file_id = (st.st_dev, st.st_ino)
+
+    def _sync(self):
+        # Replay the records other sessions appended since; under the lock.
+        try:
+            st = os.stat(self.path)
+            moved = (st.st_dev, st.st_ino) != self._file_id
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self._open()
+        self._file.seek(self._offset)
+        data = self._file.read()
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn line from a crash mid-append.
+                continue
+            self._replay(record, len(line))
+            self._records += 1
+        self._offset += end
+        # A torn final line: the next record starts on a line of its own.
+        self._torn = end < len(data)
+        metrics.add_io('undo log', read=len(data))
+
+    @contextmanager
+    def _shared(self):
+        # Changes to the stacks, made on top of every other session's.
+        if self._file is None:
+            yield
+            return
+        with self._file_lock:
+            self._sync()
+            yield
+
+    def _remove(self, name, step_id):
+        stack = self.stacks[name]
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i][0] == step_id:
+                entry = stack[i]
+                del stack[i]
+                self.bytes -= entry[3]
+                return entry
+        return None
+
+    def _replay(self, record, size):
+        if 'push' in record:
+            step_id = record.get('id') or uuid.uuid4().hex
+            self.stacks[record['push']].append((step_id, record['label'], record['deltas'], size))
+            self.bytes += size
+        elif 'pop' in record or 'drop' in record:
+            name = record.get('pop') or record.get('drop')
+            stack = self.stacks[name]
+            if 'id' in record:
+                self._remove(name, record['id'])
+            elif stack:
+                # Written before steps had ids.
+                self.bytes -= (stack.pop() if 'pop' in record else stack.popleft())[3]
+        elif 'clear' in record:
+            if 'ids' in record:
+                for step_id in record['ids']:
+                    self._remove('undo', step_id) or self._remove('redo', step_id)
+            else:
+                for name in record['clear']:
+                    self.bytes -= sum(entry[3] for entry in self.stacks[name])
+                    self.stacks[name].clear()
+
+    def _write(self, record):
+        line = json.dumps(record) + '\n'
+        if self._file is not None:
+            if self._torn:
+                line = '\n' + line
+                self._torn = False
+            self._file.write(line.encode())
+            self._file.flush()
+            # Under the lock: nothing was appended after our own record.
+            self._offset = self._file.tell()
+            self._records += 1
+            metrics.add_io('undo log', written=len(line))
+        return len(line)
+
+    def _rewrite(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for name, stack in self.stacks.items():
+                for step_id, label, deltas, _ in stack:
+                    f.write(json.dumps({'push': name, 'id': step_id, 'label': label, 'deltas': deltas}) + '\n')
+            metrics.add_io('undo log', written=f.tell())
+        os.replace(tmp_path, self.path)
+        # Other sessions notice the new file and read it from the start.
+        self._open()
+        self._sync()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_lock.close()
+
+    # 📚 Stacks
+    def _push(self, name, label, deltas):
+        step_id = uuid.uuid4().hex
+        size = self._write({'push': name, 'id': step_id, 'label': label, 'deltas': deltas})
+        self.stacks[name].append((step_id, label, deltas, size))
+        self.bytes += size
+        self._trim()
+
+    def _pop(self, name):
+        step_id, label, deltas, size = self.stacks[name].pop()
+        self.bytes -= size
+        self._write({'pop': name, 'id': step_id})
+        return label, deltas
+
+    def _clear(self, *names):
+        ids = [entry[0] for name in names for entry in self.stacks[name]]
+        if ids:
+            self._write({'clear': list(names), 'ids': ids})
+            self._replay({'clear': list(names), 'ids': ids}, 0)
+
+    def _trim(self):
+        # Oldest undo steps go first; redo steps only exist after an undo.
+        undo = self.stacks['undo']
+        while undo and (len(undo) > self.depth or self.bytes > self.max_bytes):
+            step_id, _, _, size = undo.popleft()
+            self.bytes -= size
+            self._write({'drop': 'undo', 'id': step_id})
+
+    def can_undo(self):
+        return bool(self.stacks['undo'])
+
+    def can_redo(self):
+        return bool(self.stacks['redo'])
+
+    # 🧾 Recording
+    @contextmanager
+    def action(self, label):
+        if self._group is not None:
+            # Nested actions (or changes made while undoing) join the outer group.
+            yield
+            return
+        self._start_group()
+        try:
+            yield
+        finally:
+            with self._shared():
+                deltas = self._end_group()
+                if deltas:
+                    self._push('undo', label, deltas)
+                    self._clear('redo')
+
+    def _start_group(self):
+        self._group = []
+        self._group_bytes = 0
+        self._overflow = False
+
+    def _end_group(self):
+        deltas, self._group = self._group, None
+        self.overflowed = self._overflow
+        if self._overflow:
+            # Too large to keep: the step cannot be undone, and neither can
+            # anything before it.
+            self._clear('undo', 'redo')
+            return None
+        return deltas
+
+    def _record(self, delta, min_size=0):
+        if self.store.syncing:
+            # Another session's change; it is not ours to undo.
+            return
+        if self._group is None:
+            with self.action(EVENT_LABELS[delta[0]]):
+                self._record(delta, min_size)
+            return
+        if self._overflow:
+            return
+        if min_size > self.max_bytes:
+            size = min_size
+        else:
+            size = len(json.dumps(delta))
+        self._group_bytes += size
+        if self._group_bytes > self.max_bytes:
+            self._overflow = True
+            self._group = []
+        else:
+            self._group.append(delta)
+
+    # ⏪ Undo / redo
+    def undo(self):
+        return self._step('undo', 'redo')
+
+    def redo(self):
+        return self._step('redo', 'undo')
+
+    def _step(self, source, target):
+        # Returns the label of the reverted step, or None if there was none.
+        with self._shared():
+            if not self.stacks[source]:
+                return None
+            label, deltas = self._pop(source)
+        self._start_group()
+        self.replaying = True
+        done = False
+        try:
+            with self.store.batch():
+                for delta in reversed(deltas):
+                    self._apply(delta)
+            done = True
+        finally:
+            self.replaying = False
+            with self._shared():
+                recorded = self._end_group()
+                if not done and self.store.atomic_batches:
+                    # Rolled back: none of it happened.
+                    recorded = None
+                if recorded:
+                    self._push(target, label, recorded)
+                if not done:
+                    # Failed partway (a conflict, say): the step goes back.
+                    # Deltas skip what is already applied, so running it
+                    # again finishes it.
+                    self._push(source, label, deltas)
+        return label
+
+    def _index(self, task_id):
+        try:
+            return self.store.index_of(task_id)
+        except (KeyError, ValueError):
+            return None
+
+    def _apply(self, delta):
+        # Deltas refer to tasks by id; a task that is already gone (or back)
+        # is skipped rather than touched twice.
+        op = delta[0]
+        if op == 'delete':
+            index = self._index(delta[1])
+            if index is not None:
+                self.store.delete(index)
+        elif op == 'update':
+            index = self._index(delta[1])
+            if index is not None:
+                self.store.update(index, fields_from_dict(delta[2]))
+        elif op == 'add':
+            task = Task.from_dict(delta[1])
+            if self._index(task.id) is None:
+                self.store.insert(delta[2], task)
+        elif op == 'order':
+            self.store.reorder(delta[1])
+        elif op == 'reset':
+            self.store.replace([Task.from_dict(t) for t in delta[1]])
+
+    # 👂 Store events
+    def on_add(self, task):
+        self._record(['delete', task.id])
+
+    def on_update(self, task, old):
+        self._record(['update', task.id, fields_to_dict(old)])
+
+    def on_delete(self, task, index):
+        self._record(['add', task.to_dict(), index])
+
+    def on_reorder(self, tasks, old_order):
+        self._record(['order', old_order], len(old_order) * MIN_ID_BYTES)
+
+    def on_reset(self, tasks, old_tasks):
+        if len(old_tasks) * MIN_TASK_BYTES > self.max_bytes:
+            self._record(['reset', None], len(old_tasks) * MIN_TASK_BYTES)
+        else:
+            self._record(['reset', [t.to_dict() for t in old_tasks]])
+
+
+def open_undo(path, store, depth=UNDO_DEPTH, max_bytes=UNDO_MAX_BYTES):
+    undo = UndoLog(store, path, depth, max_bytes)
+    store.subscribe(undo)
+    return undo
@@ -0,0 +1,52 @@
+# 👀 Lazy task views
+#
+# Filters and searches hand back a LazyView instead of a list. Items are
+# pulled from the underlying iterator only when a page needs them, so showing
+# the first page of a filter over a huge task list costs one page of work.
+
+
+class LazyView:
+    def __init__(self, items, length=None):
+        self._items = []
+        self._source = iter(items)
+        self._length = length
+
+    def _fill(self, count):
+        while self._source is not None and len(self._items) < count:
+            try:
+                self._items.append(next(self._source))
+            except StopIteration:
+                self._source = None
+                self._length = len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else float('inf'))
+            return self._items[index]
+        self._fill(index + 1)
+        return self._items[index]
+
+    def __bool__(self):
+        self._fill(1)
+        return bool(self._items)
+
+    def known_length(self):
+        # None until the view has been fully consumed (or the length was given).
+        return self._length
+
+    def has_more(self, count):
+        self._fill(count + 1)
+        return len(self._items) > count
+
+    def __len__(self):
+        self._fill(float('inf'))
+        return self._length
+
+    def __iter__(self):
+        index = 0
+        while True:
+            self._fill(index + 1)
+            if index >= len(self._items):
+                return
+            yield self._items[index]
+            index += 1
@@ -1,20 +1,71 @@
 import os
+import sys
+import atexit
 import json
-import csv
 import random
-import time
+import threading
 from datetime import datetime
 from colorama import init, Fore, Back
-from prettytable import PrettyTable
-from playsound import playsound
+from task_model import Task, Priority, Status
+from task_store import open_store, ConflictError
+from task_view import LazyView
+from feedback import Feedback
+from search_index import open_index
+from task_stats import open_stats
+from task_undo import open_undo
+from task_backup import open_backups
+from task_history import open_history
+from task_reminders import open_reminders, parse_repeat, REPEATS
+from task_sort import open_views, parse_sort, format_sort, SORT_FIELDS
+from task_metrics import metrics
 
 init(autoreset=True)
 
 # 📁 Files
 TASK_FILE = 'tasks.json'
-HISTORY_FILE = 'history.log'
+HISTORY_FILE = 'history.log'  # free-text history of older versions, migrated on start
 SOUND_FILE = 'click.mp3'  # Provide your own short sound file here
-BACKUP_FILE = 'tasks_backup.json'
+BACKUP_FILE = 'tasks_backup.json'  # single-file backups of older versions
+INDEX_FILE = 'tasks.index.json'
+UNDO_FILE = 'tasks.undo.jsonl'
+SETTINGS_FILE = 'settings.json'
+
+# ⚙️ Settings
+DEFAULT_SETTINGS = {
+    "storage": "journal",  # "journal" (tasks.json + tasks.journal) or "sqlite" (tasks.db)
+    "page_size": 20,  # rows per page in task tables, 0 shows everything at once
+    "export_path": "tasks_export.csv",  # default export file, end it in .gz to compress
+    "sound": True,  # click sound after actions (played in the background)
+    "animations": True,  # animated dots while an action runs
+    "animation_speed": 1.0,  # scales the dot interval, 0 turns the dots off
+    "undo_depth": 50,  # how many actions can be undone
+    "undo_memory_kb": 1024,  # size cap for the undo/redo history
+    "backup_dir": "backups",  # incremental backups (see task_backup.py)
+    "backup_generations": 10,  # how many backups to keep
+    "backup_compress": True,  # zlib-compress backup chunks
+    "history_dir": "history",  # structured history (see task_history.py)
+    "history_segment_kb": 256,  # history is rotated into a compressed segment at this size
+    "history_segments": 50,  # how many rotated segments to keep
+    "read_only": False,  # view from a memory-mapped tasks.bin, same as --read-only
+    "server_port": 8765,  # port of `python todo_list.py serve` (see task_server.py)
+    "server_commit_ms": 2,  # writes arriving this close together are saved as one
+    "reminders": True,  # announce tasks that become due or overdue above the menu
+    "sort": "due",  # default sort offered by "Sort Tasks", e.g. "priority,due,-category"
+    "metrics": False,  # time actions and count file bytes, same as --metrics (see task_metrics.py)
+    "metrics_file": ""  # also write the metrics as JSON here at exit
+}
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE) as f:
+                settings.update(json.load(f))
+        except ValueError:
+            pass
+    return settings
+
+settings = load_settings()
 
 # 🌙 Theme Colors
 THEMES = {
@@ -65,103 +116,197 @@ STATUS_COLORS = {
     "Completed": Fore.GREEN
 }
 
-# For undo feature
-last_action = None
-last_task = None
-last_task_index = None
+# 🗄️ Task store, backend chosen by settings["storage"] (see task_store.py)
+store = None
+search_index = None
+task_stats = None
+undo_log = None
+backups = None
+history = None
+reminders = None
+sorted_views = None
 
 # 🧠 Load/Save Helpers
 def load_tasks():
-    return json.load(open(TASK_FILE)) if os.path.exists(TASK_FILE) else []
+    global store, search_index, task_stats, undo_log, backups, history, reminders, sorted_views
+    if store is not None:
+        close_tasks()
+    if settings["read_only"]:
+        # Rows are decoded from tasks.bin on demand (see task_mmap.py).
+        from task_mmap import open_mapped
+        store = open_mapped(TASK_FILE, settings["storage"])
+        search_index = None
+        undo_log = None
+        reminders = None
+    else:
+        store = open_store(TASK_FILE, settings["storage"])
+        search_index = open_index(INDEX_FILE, store)
+        undo_log = open_undo(UNDO_FILE, store, settings["undo_depth"], settings["undo_memory_kb"] * 1024)
+        reminders = open_reminders(store, undo_log)
+    task_stats = open_stats(store)
+    sorted_views = open_views(store)
+    backups = open_backups(settings["backup_dir"], store, settings["backup_generations"], settings["backup_compress"])
+    history = open_history(settings["history_dir"], HISTORY_FILE,
+                           settings["history_segment_kb"] * 1024, settings["history_segments"],
+                           writable=not settings["read_only"])
+    instrument_tasks()
+    return store.tasks
+
+def load_in_background():
+    # Runs load_tasks() on a thread so the menu can be shown right away.
+    # Returns a function that waits for it and returns the tasks.
+    result = {}
+    def load():
+        try:
+            result['tasks'] = load_tasks()
+        except BaseException as e:
+            result['error'] = e
+    loader = threading.Thread(target=load, name='task-loader', daemon=True)
+    loader.start()
+    def wait():
+        loader.join()
+        if 'error' in result:
+            raise result['error']
+        return result['tasks']
+    return wait
+
+def close_tasks():
+    global store
+    if not store.read_only:
+        undo_log.close()
+        # Stamped with the files as of the index's last update, not as they
+        # are after close, which may include other sessions' writes.
+        search_index.save(INDEX_FILE, store.synced_fingerprint())
+    store.close()
+    history.close()
+    store = None
 
 def save_tasks(tasks):
-    with open(TASK_FILE, 'w') as f:
-        json.dump(tasks, f, indent=4)
+    store.replace(tasks)
 
 def log_history(action, task):
-    with open(HISTORY_FILE, 'a') as f:
-        f.write(f"{datetime.now()} - {action}: {task['task']}\n")
+    history.log(action, task)
+
+# 🎬 Sound & animation, both off the command path (see feedback.py)
+feedback = Feedback(
+    SOUND_FILE,
+    sound=settings["sound"],
+    animations=settings["animations"],
+    speed=settings["animation_speed"]
+)
 
-# 🎬 Sound
 def play_sound():
-    if os.path.exists(SOUND_FILE):
-        try:
-            playsound(SOUND_FILE)
-        except:
-            pass
+    feedback.play()
 
 # 🔁 Transition Animation
-def transition(message="Loading", dot_count=3, delay=0.4):
-    print(theme["info"] + message, end="", flush=True)
-    for _ in range(dot_count):
-        time.sleep(delay)
-        print(".", end="", flush=True)
-    print()
+def transition(message="Loading"):
+    print(theme["info"] + message + "...")
+
+def working(message):
+    # Use as `with working("Saving"):` - dots animate until the block finishes.
+    return feedback.working(theme["info"] + message)
 
 # 📋 Show Tasks
-def show_tasks(tasks):
-    if not tasks:
-        print(theme["warning"] + "No tasks found.")
-        return
+def show_page(rows, start):
+    from prettytable import PrettyTable
     table = PrettyTable()
     table.field_names = ["ID", "Task", "Category", "Due Date", "Priority", "Status"]
     today = datetime.now().date()
-    for idx, task in enumerate(tasks):
-        emoji = EMOJIS.get(task['category'].lower(), "📝")
-        priority_emoji = PRIORITY_EMOJIS.get(task.get('priority', 'Medium'), "⭐")
-        status = task.get('status', 'Pending')
-        due_date = task['due']
+    for idx, task in enumerate(rows, start):
+        emoji = EMOJIS.get(task.category.lower(), "📝")
+        priority = task.priority.label
+        status = task.status.label
+        due_date = task.due
         # Highlight overdue/today
-        try:
-            due = datetime.strptime(due_date, "%Y-%m-%d").date()
-            if status != "Completed" and due < today:
+        if task.status != Status.COMPLETED and task.due_date is not None:
+            if task.due_date < today:
                 due_date = Fore.RED + due_date + " (Overdue)" + Fore.RESET
-            elif status != "Completed" and due == today:
+            elif task.due_date == today:
                 due_date = Fore.BLUE + due_date + " (Today)" + Fore.RESET
-        except:
-            pass
         table.add_row([
             idx + 1,
-            f"{emoji} {task['task']}",
-            task['category'],
+            f"{emoji} {task.task}" + (f" 🔁 {task.repeat}" if task.repeat else ""),
+            task.category,
             due_date,
-            priority_emoji + " " + task.get('priority', 'Medium'),
-            STATUS_COLORS.get(status, "") + status + Fore.RESET
+            PRIORITY_EMOJIS[priority] + " " + priority,
+            STATUS_COLORS[status] + status + Fore.RESET
         ])
     print(theme["primary"] + str(table))
 
+# Only the rows on screen are formatted. `tasks` is either the task list or a
+# LazyView from a filter/search, which is only consumed as far as needed.
+def show_tasks(tasks):
+    if not tasks:
+        print(theme["warning"] + "No tasks found.")
+        return
+    show_paged(tasks, show_page)
+
+def show_paged(rows, render):
+    page_size = settings["page_size"]
+    if page_size <= 0:
+        render(rows[:], 0)
+        return
+    page = 0
+    while True:
+        start = page * page_size
+        render(rows[start:start + page_size], start)
+        if isinstance(rows, LazyView):
+            more = rows.has_more(start + page_size)
+            total = rows.known_length()
+        else:
+            total = len(rows)
+            more = start + page_size < total
+        if page == 0 and not more:
+            return
+        pages = f"{page + 1}/{-(-total // page_size)}" if total is not None else f"{page + 1}"
+        cmd = input(theme["info"] + f"Page {pages} - [n]ext  [p]rev  [j]ump <page>  [Enter] done: ").strip().lower()
+        if cmd == 'n' and more:
+            page += 1
+        elif cmd == 'p' and page > 0:
+            page -= 1
+        elif cmd.startswith('j') and cmd[1:].strip().isdigit():
+            target = max(int(cmd[1:]) - 1, 0)
+            if not rows[target * page_size:target * page_size + 1]:
+                target = max(len(rows) - 1, 0) // page_size
+            page = target
+        elif cmd == '':
+            return
+
 # ✅ Add Task
 def add_task(tasks):
     task_name = input("Enter task: ")
     category = input("Category (Work/Personal/Other): ").capitalize()
     due_date = input("Due date (YYYY-MM-DD): ")
     priority = input("Priority (High/Medium/Low): ").capitalize()
-    status = "Pending"
-    tasks.append({
-        'task': task_name,
-        'category': category,
-        'due': due_date,
-        'priority': priority if priority in PRIORITY_EMOJIS else "Medium",
-        'status': status
-    })
-    transition("Adding task")
-    save_tasks(tasks)
+    repeat = read_repeat(f"Repeat ({'/'.join(REPEATS)}, blank for none): ", "")
+    with working("Adding task"), undo_log.action("Add task"):
+        task = store.add(Task(task_name, category, due_date, Priority.from_label(priority), repeat=repeat))
+    log_history("Added", task)
     play_sound()
     print(theme["success"] + "✅ Task added successfully!")
 
+def warn_if_not_undoable(label):
+    # After an action too large for undo_memory_kb (see task_undo.py).
+    if undo_log.overflowed:
+        print(theme["warning"] + f"⚠️ {label} was too large to undo (over {settings['undo_memory_kb']} KB of "
+              "undo history); earlier steps can no longer be undone either.")
+
+def read_repeat(prompt, current):
+    try:
+        return parse_repeat(input(prompt) or current)
+    except ValueError as e:
+        print(theme["warning"] + f"{e}; keeping {current or 'no repeat'}.")
+        return current
+
 # ❌ Delete Task
 def delete_task(tasks):
-    global last_action, last_task, last_task_index
     show_tasks(tasks)
     index = int(input("Enter task number to delete: ")) - 1
     if 0 <= index < len(tasks):
-        log_history("Deleted", tasks[index])
-        transition("Deleting task")
-        last_action = "delete"
-        last_task = tasks[index].copy()
-        last_task_index = index
-        del tasks[index]
-        save_tasks(tasks)
+        task = tasks[index]
+        with working("Deleting task"), undo_log.action("Delete task"):
+            store.delete(index)
+        log_history("Deleted", task)
         play_sound()
         print(theme["error"] + "❌ Task deleted.")
     else:
@@ -169,19 +314,17 @@ def delete_task(tasks):
 
 # ✅ Complete Task
 def complete_task(tasks):
-    global last_action, last_task, last_task_index
     show_tasks(tasks)
     index = int(input("Enter task number to complete: ")) - 1
     if 0 <= index < len(tasks):
-        log_history("Completed", tasks[index])
-        transition("Completing task")
-        last_action = "complete"
-        last_task = tasks[index].copy()
-        last_task_index = index
-        tasks[index]['status'] = "Completed"
-        save_tasks(tasks)
+        repeat = tasks[index].repeat
+        with working("Completing task"), undo_log.action("Complete task"):
+            task = store.update(index, {'status': Status.COMPLETED})
+        log_history("Completed", task)
         play_sound()
         print(theme["success"] + "✅ Task marked as completed!")
+        if repeat:
+            print(theme["info"] + f"🔁 Repeats {repeat}: the next one has been added.")
     else:
         print(theme["error"] + "Invalid task number.")
 
@@ -192,19 +335,26 @@ def edit_task(tasks):
     if 0 <= index < len(tasks):
         task = tasks[index]
         print("Leave blank to keep current value.")
-        new_name = input(f"Task name [{task['task']}]: ") or task['task']
-        new_cat = input(f"Category [{task['category']}]: ") or task['category']
-        new_due = input(f"Due date [{task['due']}]: ") or task['due']
-        new_priority = input(f"Priority [{task.get('priority', 'Medium')}]: ") or task.get('priority', 'Medium')
-        new_status = input(f"Status [{task.get('status', 'Pending')}]: ") or task.get('status', 'Pending')
-        task.update({
+        new_name = input(f"Task name [{task.task}]: ") or task.task
+        new_cat = input(f"Category [{task.category}]: ") or task.category
+        new_due = input(f"Due date [{task.due}]: ") or task.due
+        new_priority = input(f"Priority [{task.priority.label}]: ") or task.priority.label
+        new_status = input(f"Status [{task.status.label}]: ") or task.status.label
+        new_repeat = read_repeat(f"Repeat [{task.repeat or 'none'}]: ", task.repeat)
+        fields = {
             'task': new_name,
             'category': new_cat,
             'due': new_due,
-            'priority': new_priority if new_priority in PRIORITY_EMOJIS else "Medium",
-            'status': new_status if new_status in STATUS_COLORS else "Pending"
-        })
-        save_tasks(tasks)
+            'priority': Priority.from_label(new_priority),
+            'status': Status.from_label(new_status),
+            'repeat': new_repeat
+        }
+        # Only what was changed, so edits of other fields made meanwhile in
+        # another session are kept.
+        fields = {k: v for k, v in fields.items() if getattr(task, k) != v}
+        with undo_log.action("Edit task"):
+            store.update(index, fields)
+        log_history("Edited", task)
         play_sound()
         print(theme["success"] + "✏️ Task updated!")
     else:
@@ -212,110 +362,192 @@ def edit_task(tasks):
 
 # 📤 Export to CSV
 def export_to_csv(tasks):
-    transition("Exporting to CSV")
-    with open('tasks_export.csv', 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Task', 'Category', 'Due Date', 'Priority', 'Status'])
-        for task in tasks:
-            writer.writerow([
-                task['task'],
-                task['category'],
-                task['due'],
-                task.get('priority', 'Medium'),
-                task.get('status', 'Pending')
-            ])
+    from task_io import export_csv
+    path = input(f"Export file [{settings['export_path']}]: ").strip() or settings['export_path']
+    with working("Exporting to CSV"):
+        count, seconds = export_csv(tasks, path)
     play_sound()
-    print(theme["success"] + "📁 Exported to tasks_export.csv")
+    rate = count / seconds if seconds else count
+    print(theme["success"] + f"📁 Exported {count} tasks to {path} ({rate:,.0f} rows/s)")
+
+# 📥 Import from CSV/JSONL
+def import_from_file(tasks):
+    from task_io import import_tasks, import_format_supported
+    path = input("Import file (.csv or .jsonl, optionally .gz): ").strip()
+    if not os.path.exists(path):
+        print(theme["error"] + "File not found.")
+        return
+    if not import_format_supported(path):
+        print(theme["error"] + "Unsupported file type. Use .csv or .jsonl (optionally .gz).")
+        return
+    def progress(report, seconds):
+        print(theme["info"] + f"  ...{report.imported:,} imported ({report.imported / seconds:,.0f} rows/s)", end="\r", flush=True)
+    with undo_log.action("Import"):
+        report = import_tasks(store, path, on_batch=progress)
+    play_sound()
+    print()
+    print(theme["success"] + f"📥 Imported {report.imported:,} tasks, rejected {report.rejected:,} "
+          f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)")
+    warn_if_not_undoable("The import")
+    for error in report.errors:
+        print(theme["warning"] + "  " + error)
 
 # 🔍 Search Task
 def search_tasks(tasks):
-    keyword = input("Enter keyword to search: ").lower()
-    results = [t for t in tasks if keyword in t['task'].lower()]
+    query = input("Enter keywords to search (use OR for either): ")
+    if store.read_only:
+        results = store.search(query)
+    else:
+        ids = sorted(search_index.search(query))
+        results = LazyView((store.get(task_id) for task_id in ids), len(ids))
     transition("Searching")
     show_tasks(results)
 
 # 🗃️ Filter by Category
 def filter_by_category(tasks):
     category = input("Enter category to filter (Work/Personal/Other): ").capitalize()
-    results = [t for t in tasks if t['category'].capitalize() == category]
+    results = store.filter_by_category(category)
     transition("Filtering")
     show_tasks(results)
 
 # 📊 Show Statistics
 def show_stats(tasks):
-    total = len(tasks)
-    completed = sum(1 for t in tasks if t.get('status') == "Completed")
-    pending = sum(1 for t in tasks if t.get('status', 'Pending') == "Pending")
-    in_progress = sum(1 for t in tasks if t.get('status') == "In-Progress")
-    overdue = 0
-    today = datetime.now().date()
-    for t in tasks:
-        try:
-            due = datetime.strptime(t['due'], "%Y-%m-%d").date()
-            if t.get('status') != "Completed" and due < today:
-                overdue += 1
-        except:
-            pass
-    print(theme["info"] + f"Total: {total} | Completed: {completed} | Pending: {pending} | In-Progress: {in_progress} | Overdue: {overdue}")
+    stats = task_stats.summary()
+    print(theme["info"] + f"Total: {stats['total']} | Completed: {stats['completed']} | Pending: {stats['pending']} | In-Progress: {stats['in_progress']} | Overdue: {stats['overdue']}")
+    print(theme["info"] + "By category: " + ", ".join(f"{c}: {n}" for c, n in sorted(stats['by_category'].items())))
+    print(theme["info"] + "By priority: " + ", ".join(f"{p.label}: {stats['by_priority'].get(p, 0)}" for p in Priority))
 
 # 🔄 Sort Tasks
 def sort_tasks(tasks):
     print("Sort by: 1. Due Date  2. Priority  3. Status")
-    opt = input("Choose option: ")
-    if opt == '1':
-        tasks.sort(key=lambda t: t['due'])
-    elif opt == '2':
-        priority_order = {"High": 0, "Medium": 1, "Low": 2}
-        tasks.sort(key=lambda t: priority_order.get(t.get('priority', 'Medium'), 1))
-    elif opt == '3':
-        status_order = {"Pending": 0, "In-Progress": 1, "Completed": 2}
-        tasks.sort(key=lambda t: status_order.get(t.get('status', 'Pending'), 0))
-    save_tasks(tasks)
-    print(theme["success"] + "Tasks sorted!")
-    show_tasks(tasks)
-
-# ⏪ Undo Last Action
+    print(f"   or several fields, e.g. priority,due,-category ({', '.join(SORT_FIELDS)}; - or :desc for descending)")
+    spec = input(f"Choose option [{settings['sort']}]: ").strip() or settings['sort']
+    try:
+        fields = parse_sort(spec)
+    except ValueError as e:
+        print(theme["error"] + str(e))
+        return
+    # A view: the task list keeps its order unless asked to.
+    show_tasks(sorted_views.view(fields))
+    settings['sort'] = format_sort(fields)
+    if not store.read_only and input("Keep this order? (y/N): ").strip().lower() == 'y':
+        with working("Sorting"), undo_log.action("Sort"):
+            store.reorder([t.id for t in sorted_views.view(fields)])
+        print(theme["success"] + "Tasks sorted!")
+        warn_if_not_undoable("The sort")
+
+# ⏪ Undo / Redo (see task_undo.py)
 def undo_last_action(tasks):
-    global last_action, last_task, last_task_index
-    if last_action == "delete" and last_task is not None:
-        tasks.insert(last_task_index, last_task)
-        save_tasks(tasks)
-        print(theme["success"] + "Undo successful: Task restored.")
-    elif last_action == "complete" and last_task is not None:
-        tasks[last_task_index]['status'] = last_task.get('status', 'Pending')
-        save_tasks(tasks)
-        print(theme["success"] + "Undo successful: Task marked as not completed.")
-    else:
+    try:
+        label = undo_log.undo()
+    except ConflictError as e:
+        # The step is kept; running it again finishes it (see task_undo.py).
+        print(theme["error"] + f"{e}. The undo may be incomplete; choose Undo again to finish it.")
+        return
+    if label is None:
         print(theme["warning"] + "Nothing to undo.")
-    last_action = None
-    last_task = None
-    last_task_index = None
+    else:
+        print(theme["success"] + f"Undo successful: {label} reverted.")
 
-# 💾 Backup & Restore
+def redo_last_action(tasks):
+    try:
+        label = undo_log.redo()
+    except ConflictError as e:
+        print(theme["error"] + f"{e}. The redo may be incomplete; choose Redo again to finish it.")
+        return
+    if label is None:
+        print(theme["warning"] + "Nothing to redo.")
+    else:
+        print(theme["success"] + f"Redo successful: {label} applied again.")
+
+# 💾 Backup & Restore (incremental, see task_backup.py)
 def backup_tasks(tasks):
-    with open(BACKUP_FILE, 'w') as f:
-        json.dump(tasks, f, indent=4)
-    print(theme["success"] + f"Backup saved to {BACKUP_FILE}")
+    with working("Backing up"):
+        manifest = backups.backup(tasks)
+    print(theme["success"] + f"Backup saved: {manifest['count']} tasks, "
+          f"{manifest['written']} of {len(manifest['chunks'])} chunks written "
+          f"(keeping the last {settings['backup_generations']} backups in {settings['backup_dir']}/)")
+
+def pick_generation(generations):
+    newest_first = generations[::-1]
+    for n, manifest in enumerate(newest_first, 1):
+        created = manifest['created'][:19].replace('T', ' ')
+        print(f"{n}. {created}  ({manifest['count']} tasks)")
+    choice = input("Backup number, or date/time to go back to (YYYY-MM-DD [HH:MM]) [1]: ").strip() or "1"
+    if choice.isdigit():
+        index = int(choice) - 1
+        return newest_first[index] if 0 <= index < len(newest_first) else None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            when = datetime.strptime(choice, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d":
+            when = when.replace(hour=23, minute=59, second=59)
+        return backups.at(when)
+    return None
 
 def restore_tasks():
-    if os.path.exists(BACKUP_FILE):
-        with open(BACKUP_FILE, 'r') as f:
-            tasks = json.load(f)
-        save_tasks(tasks)
-        print(theme["success"] + "Tasks restored from backup.")
-        return tasks
-    else:
-        print(theme["error"] + "No backup file found.")
-        return load_tasks()
+    generations = backups.generations()
+    if not generations and os.path.exists(BACKUP_FILE):
+        backups.import_legacy(BACKUP_FILE)
+        generations = backups.generations()
+    if not generations:
+        print(theme["error"] + "No backup found.")
+        return store.tasks
+    manifest = pick_generation(generations)
+    if manifest is None:
+        print(theme["error"] + "No matching backup.")
+        return store.tasks
+    scope = input("Restore [a]ll tasks or a [s]ingle task? [a]: ").strip().lower()
+    if scope == 's':
+        words = input("Task to restore (words from its name): ").strip().lower()
+        matches = [t for t in backups.load(manifest) if words in t.task.lower()]
+        if not matches:
+            print(theme["warning"] + "No task in that backup matches.")
+            return store.tasks
+        show_tasks(matches)
+        index = int(input("Enter task number to restore: ")) - 1
+        if not 0 <= index < len(matches):
+            print(theme["error"] + "Invalid task number.")
+            return store.tasks
+        with undo_log.action("Restore task"):
+            readded = backups.restore_task(store, matches[index])
+        print(theme["success"] + ("Task re-added from backup." if readded else "Task restored from backup."))
+        return store.tasks
+    with working("Restoring"), undo_log.action("Restore"):
+        report = backups.restore(store, manifest)
+    print(theme["success"] + f"Tasks restored from backup: {report['added']} re-added, "
+          f"{report['updated']} reverted, {report['deleted']} removed"
+          + (", order restored." if report['reordered'] else "."))
+    warn_if_not_undoable("The restore")
+    return store.tasks
+
+# 📜 View History (newest first, see task_history.py)
+def show_history_page(rows, start):
+    from prettytable import PrettyTable
+    table = PrettyTable()
+    table.field_names = ["Time", "Action", "Task ID", "Task"]
+    for entry in rows:
+        table.add_row([entry['t'].replace('T', ' '), entry['action'],
+                       entry['id'] if entry['id'] is not None else "", entry['task']])
+    print(theme["primary"] + str(table))
 
-# 📜 View History
 def view_history():
+    action = input("Filter by action (Added/Edited/Completed/Deleted, blank for all): ").strip()
+    task = input("Filter by task (id or words, blank for all): ").strip()
+    since = input("Since (YYYY-MM-DD, blank for all): ").strip()
     transition("Fetching history")
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, 'r') as f:
-            print(theme["primary"] + "\n" + f.read())
-    else:
+    entries = LazyView(history.query(
+        action=action or None,
+        task_id=int(task) if task.isdigit() else None,
+        text=task if task and not task.isdigit() else None,
+        since=since or None,
+    ))
+    if not entries:
         print(theme["warning"] + "No history found.")
+        return
+    show_paged(entries, show_history_page)
 
 # 🌓 Toggle Theme
 def toggle_theme():
@@ -324,12 +556,61 @@ def toggle_theme():
     theme = THEMES[current_theme]
     print(theme["info"] + f"Theme switched to {current_theme.upper()} mode.")
 
+# 📈 Metrics (see task_metrics.py)
+MENU_ACTIONS = ('show_tasks', 'add_task', 'delete_task', 'complete_task', 'edit_task', 'export_to_csv',
+                'import_from_file', 'search_tasks', 'filter_by_category', 'show_stats', 'sort_tasks',
+                'undo_last_action', 'redo_last_action', 'backup_tasks', 'restore_tasks', 'view_history',
+                'load_tasks', 'close_tasks', 'show_page', 'show_reminders')
+STORE_OPERATIONS = ('add', 'add_many', 'update', 'delete', 'replace', 'reorder', 'refresh', 'filter_by_category')
+
+def start_metrics():
+    # Wraps the menu actions with timers; the session's objects are wrapped
+    # by instrument_tasks() each time they are opened.
+    if not settings["metrics"] or metrics.enabled:
+        return
+    metrics.enabled = True
+    metrics.instrument(sys.modules[__name__], MENU_ACTIONS)
+    atexit.register(lambda: metrics.dump(settings["metrics_file"] or None))
+
+def instrument_tasks():
+    metrics.watch(store)
+    metrics.instrument(store, STORE_OPERATIONS, "store.")
+    metrics.instrument(search_index, ('search',), "index.")
+    metrics.instrument(sorted_views, ('view',), "sort.")
+    metrics.instrument(undo_log, ('undo', 'redo'), "undo.")
+    metrics.instrument(backups, ('backup', 'restore'), "backup.")
+    metrics.instrument(history, ('log', 'query'), "history.")
+
+def show_metrics():
+    if not metrics.enabled:
+        print(theme["warning"] + "Metrics are off. Start with --metrics or set \"metrics\": true in settings.json.")
+        return
+    print(theme["info"] + metrics.report())
+
 # 💡 Main
+CHANGING_CHOICES = {'2', '3', '4', '5', '11', '13', '16', '17'}
+
+# ⏰ Reminders (see task_reminders.py)
+def show_reminders():
+    if reminders is None or not settings["reminders"]:
+        return
+    for kind, task in reminders.poll():
+        if kind == 'due':
+            print(theme["info"] + f"🔔 Due today: {task.task}")
+        else:
+            print(theme["error"] + f"⏰ Overdue: {task.task} (was due {task.due})")
+
 def main():
-    tasks = load_tasks()
+    # The tasks load while the menu is up; the first choice waits for them.
+    wait_for_tasks = load_in_background()
+    tasks = None
     print(theme["info"] + random.choice(QUOTES))
+    if settings["read_only"]:
+        print(theme["warning"] + "Read-only mode: tasks can be viewed, searched and exported but not changed.")
 
     while True:
+        if tasks is not None:
+            show_reminders()
         print(theme["primary"] + "\n--- 📘 To-Do List Menu ---")
         print("1. View Tasks")
         print("2. Add Task")
@@ -346,47 +627,81 @@ def main():
         print("13. Restore Tasks")
         print("14. View History")
         print("15. Toggle Theme (Dark/Light)")
-        print("16. Exit")
+        print("16. Import Tasks")
+        print("17. Redo")
+        print("18. Performance Metrics")
+        print("19. Exit")
 
         choice = input("Choose an option: ")
 
-        if choice == '1':
-            transition("Displaying tasks")
-            show_tasks(tasks)
-        elif choice == '2':
-            add_task(tasks)
-        elif choice == '3':
-            delete_task(tasks)
-        elif choice == '4':
-            complete_task(tasks)
-        elif choice == '5':
-            edit_task(tasks)
-        elif choice == '6':
-            export_to_csv(tasks)
-        elif choice == '7':
-            search_tasks(tasks)
-        elif choice == '8':
-            filter_by_category(tasks)
-        elif choice == '9':
-            show_stats(tasks)
-        elif choice == '10':
-            sort_tasks(tasks)
-        elif choice == '11':
-            undo_last_action(tasks)
-        elif choice == '12':
-            backup_tasks(tasks)
-        elif choice == '13':
-            tasks = restore_tasks()
-        elif choice == '14':
-            view_history()
-        elif choice == '15':
-            toggle_theme()
-        elif choice == '16':
-            transition("Exiting")
-            print(theme["warning"] + "Goodbye! Stay productive ✨")
-            break
-        else:
-            print(theme["error"] + "Invalid choice. Try again.")
+        if tasks is None:
+            tasks = wait_for_tasks()
+        # Show what other sessions changed while waiting at the prompt.
+        store.refresh()
+
+        try:
+            if store.read_only and choice in CHANGING_CHOICES:
+                print(theme["warning"] + "Not available in read-only mode. Start without --read-only to change tasks.")
+            elif choice == '1':
+                transition("Displaying tasks")
+                show_tasks(tasks)
+            elif choice == '2':
+                add_task(tasks)
+            elif choice == '3':
+                delete_task(tasks)
+            elif choice == '4':
+                complete_task(tasks)
+            elif choice == '5':
+                edit_task(tasks)
+            elif choice == '6':
+                export_to_csv(tasks)
+            elif choice == '7':
+                search_tasks(tasks)
+            elif choice == '8':
+                filter_by_category(tasks)
+            elif choice == '9':
+                show_stats(tasks)
+            elif choice == '10':
+                sort_tasks(tasks)
+            elif choice == '11':
+                undo_last_action(tasks)
+            elif choice == '12':
+                backup_tasks(tasks)
+            elif choice == '13':
+                tasks = restore_tasks()
+            elif choice == '14':
+                view_history()
+            elif choice == '15':
+                toggle_theme()
+            elif choice == '16':
+                import_from_file(tasks)
+            elif choice == '17':
+                redo_last_action(tasks)
+            elif choice == '18':
+                show_metrics()
+            elif choice == '19':
+                transition("Exiting")
+                close_tasks()
+                print(theme["warning"] + "Goodbye! Stay productive ✨")
+                break
+            else:
+                print(theme["error"] + "Invalid choice. Try again.")
+        except ConflictError as e:
+            print(theme["error"] + f"{e}. Nothing was changed; try again.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    args = sys.argv[1:]
+    if "--read-only" in args:
+        args.remove("--read-only")
+        settings["read_only"] = True
+    if "--metrics" in args:
+        args.remove("--metrics")
+        settings["metrics"] = True
+    start_metrics()
+    if args:
+        # Subcommands / --file run non-interactively (see cli.py). cli.py
+        # imports this module by name, so share this instance with it.
+        sys.modules.setdefault('todo_list', sys.modules[__name__])
+        from cli import run
+        sys.exit(run(args))
+    main()